@@ -1,18 +1,27 @@
+import hashlib
 import logging
+import os
+import threading
+import time
+import types
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
 from pathlib import Path
-from typing import Optional, Dict, Any
+from typing import Any, Dict, List, Optional
 
-import pygadm
 from ..mcp import gis_mcp
 from ..storage_config import get_storage_path, resolve_path
 
 logger = logging.getLogger(__name__)
 
-ALIASES = {
+# Built once at import and frozen: the alias table feeds the memoized
+# _resolve_region, and a read-only view guarantees nothing invalidates
+# those cached resolutions behind its back.
+ALIASES = types.MappingProxyType({
     "USA": "United States",
     "UK": "United Kingdom",
     "IR": "Iran",
-}
+})
 
 try:
     import pygadm
@@ -21,45 +30,260 @@ except ImportError:
     pygadm = None
     _pygadm_available = False
 
-@gis_mcp.resource("gis://operations/administrative_boundaries")
-def get_administrative_boundaries_operations() -> dict:
-    return {"operations": ["download_boundaries"]}
+@lru_cache(maxsize=256)
+def _resolve_region(region: str) -> str:
+    """Canonicalize a region name, resolving aliases like 'UK'."""
+    return ALIASES.get(region.upper(), region)
 
-@gis_mcp.tool()
-def download_boundaries(region: str, level: int = 1, path: Optional[str] = None) -> Dict[str, Any]:
+
+@lru_cache(maxsize=256)
+def _slug(name: str) -> str:
+    """Filename-safe form of a canonical region name ('United States' -> 'United_States')."""
+    return name.replace(" ", "_")
+
+
+def _gadm_version() -> str:
+    """Version of the pygadm data source, for cache keying."""
+    return getattr(pygadm, "__version__", "unknown")
+
+
+def _cache_key(name: str, level: int, fmt: str, gadm_version: str) -> str:
+    """Digest over every input that determines the output file.
+
+    Embedding the GADM/pygadm version in the filename means a version
+    bump naturally misses the old cache entry instead of silently
+    serving outdated boundaries.
     """
-    Download GADM administrative boundaries and save as GeoJSON.
+    raw = f"{name}|{level}|{fmt}|{gadm_version}"
+    return hashlib.sha1(raw.encode()).hexdigest()[:12]
 
-    Args:
-        region: e.g. "USA" or "United States"
-        level: 0=country, 1=state, 2=county, ...
-        path: custom output folder
 
-    Returns:
-        {"status": "success", "file_path": "..."} or {"status": "error", "message": "..."}
+@lru_cache(maxsize=32)
+def _fetch_admitems(name: str, level: int):
+    """Fetch GADM boundaries via pygadm, memoized per (name, level).
+
+    Keeps the parsed GeoDataFrame in-process so repeat requests in one
+    session skip pygadm's network fetch and parse even when the on-disk
+    copy is missing; only serialization remains per call.
     """
+    return pygadm.AdmItems(name=name, content_level=level)
+
+
+# Output directories already created this session; lets the batch path
+# skip redundant mkdir/stat syscalls when many workers share one root
+_ensured_dirs: set = set()
+_ensured_lock = threading.Lock()
+
+
+def _ensure_dir(path: Path) -> None:
+    """mkdir -p, skipping the syscall for directories known to exist."""
+    with _ensured_lock:
+        if path in _ensured_dirs:
+            return
+    path.mkdir(parents=True, exist_ok=True)
+    with _ensured_lock:
+        _ensured_dirs.add(path)
+
+
+def _cache_is_fresh(file_path: Path, max_age: Optional[float]) -> bool:
+    """True if a cached boundary file exists, is non-empty, and is younger than max_age."""
+    try:
+        stat = file_path.stat()
+    except OSError:
+        return False
+    if stat.st_size == 0:
+        return False
+    if max_age is not None and (time.time() - stat.st_mtime) > max_age:
+        return False
+    return True
+
+
+# Supported on-disk formats. Binary columnar/WKB formats are several
+# times smaller and faster to read/write than text GeoJSON, so parquet
+# is the default for the cached copy; GeoJSON stays available for
+# callers that need it for interchange.
+_FORMATS = ("parquet", "fgb", "geojson")
+
+
+def _write_gdf(gdf, file_path: Path, fmt: str) -> None:
+    """Serialize a GeoDataFrame in the requested format."""
+    if fmt == "parquet":
+        gdf.to_parquet(file_path)
+    elif fmt == "fgb":
+        gdf.to_file(file_path, driver="FlatGeobuf")
+    else:
+        gdf.to_file(file_path, driver="GeoJSON")
+
+
+def _download_one(
+    region: str,
+    level: int = 1,
+    path: Optional[str] = None,
+    force_refresh: bool = False,
+    max_age: Optional[float] = None,
+    format: str = "parquet",
+) -> Dict[str, Any]:
+    """Core download/cache logic shared by the single and batch tools."""
     try:
         if not _pygadm_available:
             raise ImportError("pygadm is not installed. Please install with 'pip install gis-mcp[administrative-boundaries]'.")
-        region = ALIASES.get(region.upper(), region)  
+        fmt = format.lower()
+        if fmt not in _FORMATS:
+            raise ValueError(f"Unsupported format '{format}'; choose one of {', '.join(_FORMATS)}")
+        region = _resolve_region(region)
         if path:
             out_dir = resolve_path(path, relative_to_storage=True)
         else:
             # Use storage path with administrative_boundaries subdirectory
             storage = get_storage_path()
             out_dir = storage / "administrative_boundaries"
-        out_dir.mkdir(parents=True, exist_ok=True)
-
-        # new pygadm API
-        gdf = pygadm.AdmItems(name=region, content_level=level)
+        _ensure_dir(out_dir)
 
-        file_name = f"{region.replace(' ', '_')}_adm{level}.geojson"
+        key = _cache_key(region, level, fmt, _gadm_version())
+        file_name = f"{_slug(region)}_adm{level}_{key}.{fmt}"
         file_path = out_dir / file_name
-        gdf.to_file(file_path, driver="GeoJSON")
+
+        # Cache hit: a non-empty (and fresh enough) file short-circuits
+        # the whole GADM fetch to a stat call
+        if not force_refresh and _cache_is_fresh(file_path, max_age):
+            logger.info("Serving cached %s level %s from %s", region, level, file_path)
+            return {"status": "success", "file_path": str(file_path), "cached": True}
+
+        # force_refresh means truly fresh data, so drop the in-process
+        # copies as well as skipping the on-disk one
+        if force_refresh:
+            _fetch_admitems.cache_clear()
+
+        # new pygadm API (memoized per region/level)
+        gdf = _fetch_admitems(region, level)
+
+        # Write to a sidecar then rename: os.replace is atomic, so a
+        # crash mid-write can never leave a half-valid file for the
+        # cache check (or a concurrent batch worker) to pick up
+        tmp_path = file_path.with_name(file_path.name + ".part")
+        try:
+            _write_gdf(gdf, tmp_path, fmt)
+            os.replace(tmp_path, file_path)
+        finally:
+            tmp_path.unlink(missing_ok=True)
+
+        # Best-effort human-readable alias next to the content-addressed
+        # file; skipped on filesystems without symlink support
+        alias_path = out_dir / f"{_slug(region)}_adm{level}.{fmt}"
+        try:
+            alias_path.unlink(missing_ok=True)
+            alias_path.symlink_to(file_name)
+        except OSError:
+            pass
 
         logger.info("Saved %s level %s to %s", region, level, file_path)
-        return {"status": "success", "file_path": str(file_path)}
+        return {"status": "success", "file_path": str(file_path), "cached": False}
 
     except Exception as e:
         logger.exception("Failed to download boundaries")
         return {"status": "error", "message": str(e)}
+
+
+@gis_mcp.resource("gis://operations/administrative_boundaries")
+def get_administrative_boundaries_operations() -> dict:
+    return {"operations": ["download_boundaries", "download_boundaries_many"]}
+
+@gis_mcp.tool()
+def download_boundaries(
+    region: str,
+    level: int = 1,
+    path: Optional[str] = None,
+    force_refresh: bool = False,
+    max_age: Optional[float] = None,
+    format: str = "parquet",
+) -> Dict[str, Any]:
+    """
+    Download GADM administrative boundaries and save to disk.
+
+    Repeat requests for the same (region, level) are served from the
+    file already on disk instead of re-hitting GADM; pass
+    force_refresh=True (or a max_age in seconds that the cached file's
+    mtime exceeds) to fetch again.
+
+    Args:
+        region: e.g. "USA" or "United States"
+        level: 0=country, 1=state, 2=county, ...
+        path: custom output folder
+        force_refresh: re-download even if a cached file exists
+        max_age: maximum cached-file age in seconds before re-download
+        format: "parquet" (GeoParquet, default), "fgb" (FlatGeobuf)
+            or "geojson"
+
+    Returns:
+        {"status": "success", "file_path": "...", "cached": bool}
+        or {"status": "error", "message": "..."}
+    """
+    return _download_one(region, level, path, force_refresh, max_age, format)
+
+
+@gis_mcp.tool()
+def download_boundaries_many(
+    requests: List[Dict[str, Any]],
+    path: Optional[str] = None,
+    max_workers: int = 8,
+    format: str = "parquet",
+) -> Dict[str, Any]:
+    """
+    Download boundaries for many regions concurrently.
+
+    Each download is independent and I/O-bound (network fetch, file
+    write), so the batch runs on a thread pool and finishes in roughly
+    the time of the slowest fetch rather than the sum of all of them.
+    Per-item failures are reported in place; they do not abort the rest
+    of the batch.
+
+    Args:
+        requests: list of {"region": ..., "level": ..., "force_refresh": ...,
+            "max_age": ...} dicts; only "region" is required
+        path: custom output folder shared by all items
+        max_workers: thread-pool size
+        format: default on-disk format for items that don't set their own
+
+    Returns:
+        {"status": "success"|"partial"|"error", "results": [...],
+         "success_count": int, "error_count": int} with results in
+        request order
+    """
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        # Malformed items become in-place error results rather than
+        # aborting the whole batch, matching the per-item contract
+        slots: List[Any] = []
+        for item in requests:
+            if not isinstance(item, dict) or not item.get("region"):
+                slots.append(
+                    {"status": "error", "message": "Each request item must be a dict with a 'region' key"}
+                )
+                continue
+            slots.append(
+                executor.submit(
+                    _download_one,
+                    item["region"],
+                    item.get("level", 1),
+                    path,
+                    item.get("force_refresh", False),
+                    item.get("max_age"),
+                    item.get("format", format),
+                )
+            )
+        results = [
+            slot if isinstance(slot, dict) else slot.result() for slot in slots
+        ]
+
+    error_count = sum(1 for r in results if r.get("status") == "error")
+    if error_count == 0:
+        status = "success"
+    elif error_count == len(results):
+        status = "error"
+    else:
+        status = "partial"
+    return {
+        "status": status,
+        "results": results,
+        "success_count": len(results) - error_count,
+        "error_count": error_count,
+    }
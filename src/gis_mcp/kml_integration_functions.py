@@ -4,11 +4,18 @@ This module provides tools for parsing, validating, and converting KML/KMZ files
 containing transmission line routes, tower locations, and related infrastructure.
 Designed for integration with ShadowSpan and similar GIS applications.
 """
-import os
+import hashlib
+import io
 import logging
+import re
+import sys
+import threading
 import zipfile
-import tempfile
-from typing import Any, Dict, List, Optional
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import closing
+from functools import partial
+from typing import Any, Dict, List, Optional, Union
 from xml.etree import ElementTree as ET
 from .mcp import gis_mcp
 
@@ -17,16 +24,72 @@ logger = logging.getLogger(__name__)
 
 # Import required libraries
 try:
-    from shapely.geometry import Point, LineString, Polygon, MultiPoint, mapping
-    from shapely import wkt
+    import numpy as np
     import json
 except ImportError as e:
     logger.error(f"Required dependencies not available: {e}")
     raise
 
+# Optional lxml acceleration (C parser + streaming iterparse); stdlib
+# ElementTree remains the fallback when lxml is not installed.
+try:
+    from lxml import etree as LET
+except ImportError:
+    LET = None
+
+# Optional orjson acceleration for GeoJSON serialization
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# Prefer defusedxml's hardened iterparse for the stdlib path when it is
+# installed; KML content arrives from MCP clients and may be untrusted.
+try:
+    from defusedxml.ElementTree import iterparse as _et_iterparse
+except ImportError:
+    _et_iterparse = ET.iterparse
+
 
 # KML namespace
-KML_NS = {'kml': 'http://www.opengis.net/kml/2.2'}
+_NS = 'http://www.opengis.net/kml/2.2'
+KML_NS = {'kml': _NS}
+
+# Clark-notation tag names, precomputed once so the hot parsing paths never
+# re-interpret 'kml:' prefixes or namespace maps per element.
+_PLACEMARK_TAG = f'{{{_NS}}}Placemark'
+_TAG_NAME = f'{{{_NS}}}name'
+_TAG_DESC = f'{{{_NS}}}description'
+_TAG_POINT = f'{{{_NS}}}Point'
+_TAG_LINESTRING = f'{{{_NS}}}LineString'
+_TAG_POLYGON = f'{{{_NS}}}Polygon'
+_TAG_COORDINATES = f'{{{_NS}}}coordinates'
+_TAG_OUTER_BOUNDARY = f'{{{_NS}}}outerBoundaryIs'
+_TAG_INNER_BOUNDARY = f'{{{_NS}}}innerBoundaryIs'
+_TAG_LINEAR_RING = f'{{{_NS}}}LinearRing'
+_TAG_EXT_DATA = f'{{{_NS}}}ExtendedData'
+_TAG_DATA = f'{{{_NS}}}Data'
+_TAG_VALUE = f'{{{_NS}}}value'
+_TAG_DOCUMENT = f'{{{_NS}}}Document'
+_TAG_STYLE = f'{{{_NS}}}Style'
+_TAG_LINE_STYLE = f'{{{_NS}}}LineStyle'
+_TAG_ICON_STYLE = f'{{{_NS}}}IconStyle'
+_TAG_COLOR = f'{{{_NS}}}color'
+_TAG_WIDTH = f'{{{_NS}}}width'
+_TAG_ICON_HREF = f'{{{_NS}}}Icon/{{{_NS}}}href'
+_TAG_SCALE = f'{{{_NS}}}scale'
+
+# Parallel parsing kicks in only for very large documents, where the
+# placemark work dwarfs process startup and feature pickling costs.
+_PARALLEL_THRESHOLD_BYTES = 32_000_000
+_PARALLEL_CHUNK_BYTES = 8_000_000
+
+# Parsed-KML cache: tool pipelines typically run validate/convert/extract
+# back-to-back on the same content, so successful parses are kept keyed by
+# a content hash plus the parse flags.
+_PARSE_CACHE_SIZE = 32
+_parse_cache: 'OrderedDict[tuple, Dict[str, Any]]' = OrderedDict()
+_parse_cache_lock = threading.Lock()
 
 
 @gis_mcp.resource("gis://kml/operations")
@@ -36,6 +99,7 @@ def get_kml_operations() -> Dict[str, List[str]]:
         "operations": [
             "parse_kml_file",
             "extract_kmz",
+            "parse_kmz",
             "validate_transmission_line_kml",
             "convert_kml_to_geojson",
             "extract_tower_locations",
@@ -45,64 +109,177 @@ def get_kml_operations() -> Dict[str, List[str]]:
     }
 
 
-def _parse_kml_file_internal(
-    kml_content: str,
+def _parse_kml_file_internal_lxml(
+    kml_content: Union[str, bytes],
     extract_styles: bool = True,
-    include_metadata: bool = True
+    include_metadata: bool = True,
+    wanted_types: Optional[frozenset] = None
 ) -> Dict[str, Any]:
-    """Internal KML parsing function."""
-    """Parse KML content and extract geographic features.
+    """Internal KML parsing function using lxml's streaming iterparse.
 
-    Processes KML XML to extract placemarks, geometries, and metadata.
-    Supports Points, LineStrings, and Polygons.
+    Placemarks are consumed one at a time from the byte stream and cleared
+    after processing, so memory stays bounded on multi-MB KML documents.
+    Accepts bytes directly (e.g. straight from a KMZ archive entry) so no
+    str round-trip is needed before parsing.
+    """
+    data = kml_content.encode('utf-8') if isinstance(kml_content, str) else kml_content
+    return _parse_kml_source_lxml(
+        lambda: io.BytesIO(data), extract_styles, include_metadata, wanted_types)
 
-    Args:
-        kml_content: KML file content as string
-        extract_styles: Whether to extract style information
-        include_metadata: Whether to include extended data and descriptions
 
-    Returns:
-        Dictionary containing:
-        - features: List of extracted features with geometries
-        - feature_count: Total number of features
-        - geometry_types: Summary of geometry types found
-        - styles: Style definitions if extract_styles=True
-        - metadata: Document-level metadata
+def _parse_kml_source_lxml(
+    open_source,
+    extract_styles: bool = True,
+    include_metadata: bool = True,
+    wanted_types: Optional[frozenset] = None
+) -> Dict[str, Any]:
+    """Streaming lxml parse over binary streams produced by open_source.
 
-    Example:
-        >>> parse_kml_file(kml_string, True, True)
-        {'features': [...], 'feature_count': 45, ...}
+    open_source is a zero-argument callable returning a fresh readable
+    binary stream (a BytesIO, or a KMZ archive entry); it is invoked once
+    per pass so the document bytes never have to live in memory at once.
     """
     try:
-        # Parse XML
-        root = ET.fromstring(kml_content)
-
         features = []
         styles = {}
         metadata = {}
 
-        # Extract document metadata
-        if include_metadata:
-            doc_name = root.find('.//kml:Document/kml:name', KML_NS)
-            doc_desc = root.find('.//kml:Document/kml:description', KML_NS)
+        # Document metadata and styles live outside Placemarks, so grab
+        # them with a scoped iterparse pass before the placemark pass.
+        # Placemark ends are watched too, purely to clear them as they
+        # complete — otherwise their subtrees (including the large
+        # coordinates text) would accumulate and this pass would hold
+        # roughly the whole document in memory.
+        if include_metadata or extract_styles:
+            doc_name = doc_desc = None
+            meta_tags = (_TAG_NAME, _TAG_DESC, _TAG_STYLE, _PLACEMARK_TAG)
+            with closing(open_source()) as source:
+                for _, elem in LET.iterparse(source, events=('end',), tag=meta_tags):
+                    tag = elem.tag
+                    if tag == _PLACEMARK_TAG:
+                        # Placemarks belong to the second pass; discard
+                        # them (and already consumed siblings) here
+                        elem.clear()
+                        while elem.getprevious() is not None:
+                            del elem.getparent()[0]
+                    elif tag == _TAG_STYLE:
+                        if extract_styles:
+                            style_id = elem.get('id')
+                            if style_id:
+                                styles[style_id] = _extract_style_info(elem)
+                        elem.clear()
+                    elif include_metadata:
+                        parent = elem.getparent()
+                        if parent is not None and parent.tag == _TAG_DOCUMENT:
+                            if tag == _TAG_NAME and doc_name is None:
+                                doc_name = elem.text
+                            elif tag == _TAG_DESC and doc_desc is None:
+                                doc_desc = elem.text
+
+            if include_metadata:
+                metadata = {"name": doc_name, "description": doc_desc}
+
+        # Stream placemarks, clearing processed elements (and their already
+        # consumed siblings) to keep the partial tree small.
+        with closing(open_source()) as source:
+            for _, placemark in LET.iterparse(source, events=('end',), tag=_PLACEMARK_TAG):
+                feature = _parse_placemark(placemark, include_metadata, wanted_types)
+                if feature:
+                    features.append(feature)
+                placemark.clear()
+                while placemark.getprevious() is not None:
+                    del placemark.getparent()[0]
 
-            metadata = {
-                "name": doc_name.text if doc_name is not None else None,
-                "description": doc_desc.text if doc_desc is not None else None
-            }
+        # Analyze geometry types
+        geometry_types = {}
+        for feature in features:
+            geom_type = feature.get('geometry_type')
+            geometry_types[geom_type] = geometry_types.get(geom_type, 0) + 1
+
+        result = {
+            "features": features,
+            "feature_count": len(features),
+            "geometry_types": geometry_types,
+            "success": True
+        }
 
-        # Extract styles if requested
         if extract_styles:
-            for style_elem in root.findall('.//kml:Style', KML_NS):
-                style_id = style_elem.get('id')
-                if style_id:
-                    styles[style_id] = _extract_style_info(style_elem)
+            result["styles"] = styles
+
+        if include_metadata:
+            result["metadata"] = metadata
+
+        return result
+
+    except LET.XMLSyntaxError as e:
+        logger.error(f"KML parse error: {str(e)}")
+        return {
+            "success": False,
+            "error": f"Invalid KML format: {str(e)}",
+            "features": [],
+            "feature_count": 0
+        }
+    except Exception as e:
+        logger.error(f"Error parsing KML: {str(e)}")
+        raise ValueError(f"KML parsing failed: {str(e)}")
 
-        # Extract placemarks
-        for placemark in root.findall('.//kml:Placemark', KML_NS):
-            feature = _parse_placemark(placemark, include_metadata)
-            if feature:
-                features.append(feature)
+
+def _parse_kml_file_internal_et(
+    kml_content: Union[str, bytes],
+    extract_styles: bool = True,
+    include_metadata: bool = True,
+    wanted_types: Optional[frozenset] = None
+) -> Dict[str, Any]:
+    """Internal KML parsing function using stdlib ElementTree.
+
+    Drives expat incrementally via ET.iterparse so placemarks, styles and
+    document metadata are all collected in a single pass over the stream
+    instead of one descendant search each over a fully built tree.
+    """
+    data = kml_content.encode('utf-8') if isinstance(kml_content, str) else kml_content
+    return _parse_kml_source_et(
+        lambda: io.BytesIO(data), extract_styles, include_metadata, wanted_types)
+
+
+def _parse_kml_source_et(
+    open_source,
+    extract_styles: bool = True,
+    include_metadata: bool = True,
+    wanted_types: Optional[frozenset] = None
+) -> Dict[str, Any]:
+    """Single-pass ElementTree parse over a binary stream from open_source.
+
+    Stream-factory counterpart of _parse_kml_file_internal_et; only one
+    pass is needed, so open_source is invoked exactly once.
+    """
+    try:
+        features = []
+        styles = {}
+        metadata = {"name": None, "description": None}
+
+        with closing(open_source()) as source:
+            for _, elem in _et_iterparse(source, events=('end',)):
+                tag = elem.tag
+                if tag == _PLACEMARK_TAG:
+                    feature = _parse_placemark(elem, include_metadata, wanted_types)
+                    if feature:
+                        features.append(feature)
+                    # Release the processed subtree; the empty element stays
+                    # attached but no longer pins its children
+                    elem.clear()
+                elif tag == _TAG_STYLE:
+                    if extract_styles:
+                        style_id = elem.get('id')
+                        if style_id:
+                            styles[style_id] = _extract_style_info(elem)
+                    elem.clear()
+                elif tag == _TAG_DOCUMENT and include_metadata:
+                    if metadata["name"] is None:
+                        doc_name = elem.find(_TAG_NAME)
+                        metadata["name"] = doc_name.text if doc_name is not None else None
+                    if metadata["description"] is None:
+                        doc_desc = elem.find(_TAG_DESC)
+                        metadata["description"] = doc_desc.text if doc_desc is not None else None
 
         # Analyze geometry types
         geometry_types = {}
@@ -138,6 +315,262 @@ def _parse_kml_file_internal(
         raise ValueError(f"KML parsing failed: {str(e)}")
 
 
+def _features_to_arrays(features: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """Column-oriented (SoA) view of parsed features.
+
+    Returns parallel arrays: names and geom_types as object arrays, all
+    coordinates concatenated into one (N, 3) float64 block, and CSR-style
+    offsets so feature i owns coords[offsets[i]:offsets[i+1]]. Bulk
+    numeric passes run over the single contiguous block instead of one
+    small array per feature.
+    """
+    count = len(features)
+    names = np.empty(count, dtype=object)
+    geom_types = np.empty(count, dtype=object)
+    lengths = np.empty(count + 1, dtype=np.int64)
+    lengths[0] = 0
+    blocks = []
+
+    for i, feature in enumerate(features):
+        names[i] = feature.get('name')
+        geom_types[i] = feature['geometry_type']
+        block = np.atleast_2d(np.asarray(feature['coordinates'], dtype=np.float64))
+        blocks.append(block)
+        lengths[i + 1] = block.shape[0]
+
+    return {
+        "names": names,
+        "geom_types": geom_types,
+        "coords": np.concatenate(blocks) if blocks else np.empty((0, 3)),
+        "offsets": np.cumsum(lengths)
+    }
+
+
+_EARTH_RADIUS_KM = 6371.0088
+
+
+def _linestring_lengths_vec(coords: "np.ndarray", offsets: "np.ndarray") -> tuple:
+    """Per-line lengths over a concatenated coordinate block.
+
+    Computes every segment once with NumPy ufuncs and aggregates them per
+    line with np.add.reduceat, instead of rebuilding a Shapely geometry
+    per feature. Returns (lengths_degrees, lengths_km) arrays aligned
+    with the features behind ``offsets``; the km figure is a haversine
+    great-circle length.
+    """
+    n_lines = len(offsets) - 1
+    if coords.shape[0] < 2:
+        zeros = np.zeros(n_lines)
+        return zeros, zeros.copy()
+
+    dx = np.diff(coords[:, 0])
+    dy = np.diff(coords[:, 1])
+    seg_deg = np.hypot(dx, dy)
+
+    lat = np.radians(coords[:, 1])
+    dlat = np.diff(lat)
+    dlon = np.radians(dx)
+    hav = (np.sin(dlat / 2.0) ** 2
+           + np.cos(lat[:-1]) * np.cos(lat[1:]) * np.sin(dlon / 2.0) ** 2)
+    seg_km = 2.0 * _EARTH_RADIUS_KM * np.arcsin(np.sqrt(hav))
+
+    # Segments straddling two lines are artifacts of concatenation
+    boundary = offsets[1:-1] - 1
+    seg_deg[boundary] = 0.0
+    seg_km[boundary] = 0.0
+
+    counts = np.diff(offsets)
+    starts = np.minimum(offsets[:-1], seg_deg.size - 1)
+    lengths_deg = np.add.reduceat(seg_deg, starts)
+    lengths_km = np.add.reduceat(seg_km, starts)
+    lengths_deg[counts < 2] = 0.0
+    lengths_km[counts < 2] = 0.0
+    return lengths_deg, lengths_km
+
+
+def _index_placemarks(data: bytes) -> Optional[List[tuple]]:
+    """Locate (start, end) byte ranges of Placemark subtrees.
+
+    Returns None when the layout looks unusual (nested or self-closing
+    placemarks), in which case callers should parse serially.
+    """
+    ranges = []
+    find = data.find
+    pos = 0
+    while True:
+        start = find(b'<Placemark', pos)
+        if start == -1:
+            break
+        end = find(b'</Placemark>', start)
+        if end == -1:
+            return None
+        nested = find(b'<Placemark', start + 1)
+        if nested != -1 and nested < end:
+            return None
+        end += len(b'</Placemark>')
+        ranges.append((start, end))
+        pos = end
+    return ranges
+
+
+def _parse_placemark_chunk(
+    payload: bytes,
+    include_metadata: bool,
+    wanted_types: Optional[frozenset]
+) -> List[Dict[str, Any]]:
+    """Worker: parse a concatenation of Placemark subtrees into features."""
+    doc = (
+        b'<kml xmlns="http://www.opengis.net/kml/2.2"><Document>'
+        + payload
+        + b'</Document></kml>'
+    )
+    if LET is not None:
+        result = _parse_kml_file_internal_lxml(doc, False, include_metadata, wanted_types)
+    else:
+        result = _parse_kml_file_internal_et(doc, False, include_metadata, wanted_types)
+    if not result.get('success'):
+        raise ValueError(result.get('error', 'chunk parse failed'))
+    return result['features']
+
+
+def _parse_kml_file_parallel(
+    data: bytes,
+    extract_styles: bool,
+    include_metadata: bool,
+    wanted_types: Optional[frozenset]
+) -> Optional[Dict[str, Any]]:
+    """Parse a huge KML by fanning placemark chunks out to worker processes.
+
+    Placemark subtrees are independent once located, so the byte ranges are
+    grouped into ~8 MB payloads and parsed in a ProcessPoolExecutor; the
+    placemark-free remainder (document metadata, styles) is parsed serially.
+    Returns None whenever anything is off, so the caller can fall back to
+    the serial path.
+    """
+    ranges = _index_placemarks(data)
+    if not ranges:
+        return None
+
+    chunks = []
+    current = []
+    size = 0
+    for start, end in ranges:
+        current.append((start, end))
+        size += end - start
+        if size >= _PARALLEL_CHUNK_BYTES:
+            chunks.append(current)
+            current = []
+            size = 0
+    if current:
+        chunks.append(current)
+    if len(chunks) < 2:
+        return None
+
+    payloads = [b''.join(data[s:e] for s, e in chunk) for chunk in chunks]
+
+    try:
+        worker = partial(
+            _parse_placemark_chunk,
+            include_metadata=include_metadata,
+            wanted_types=wanted_types,
+        )
+        with ProcessPoolExecutor() as pool:
+            feature_lists = list(pool.map(worker, payloads))
+    except Exception as e:
+        logger.warning(f"Parallel KML parse failed, falling back to serial: {str(e)}")
+        return None
+
+    features = [feature for chunk_features in feature_lists for feature in chunk_features]
+
+    # Document metadata and styles come from the placemark-free remainder,
+    # which is small and parses serially.
+    extras = {}
+    if extract_styles or include_metadata:
+        gaps = []
+        pos = 0
+        for start, end in ranges:
+            gaps.append(data[pos:start])
+            pos = end
+        gaps.append(data[pos:])
+        remainder = b''.join(gaps)
+
+        if LET is not None:
+            extras = _parse_kml_file_internal_lxml(
+                remainder, extract_styles, include_metadata)
+        else:
+            extras = _parse_kml_file_internal_et(
+                remainder, extract_styles, include_metadata)
+        if not extras.get('success'):
+            return None
+
+    geometry_types = {}
+    for feature in features:
+        geom_type = feature.get('geometry_type')
+        geometry_types[geom_type] = geometry_types.get(geom_type, 0) + 1
+
+    result = {
+        "features": features,
+        "feature_count": len(features),
+        "geometry_types": geometry_types,
+        "success": True
+    }
+
+    if extract_styles:
+        result["styles"] = extras.get('styles', {})
+
+    if include_metadata:
+        result["metadata"] = extras.get('metadata', {})
+
+    return result
+
+
+def _parse_kml_file_internal(
+    kml_content: Union[str, bytes],
+    extract_styles: bool = True,
+    include_metadata: bool = True,
+    wanted_types: Optional[frozenset] = None
+) -> Dict[str, Any]:
+    """Internal KML parsing function. Accepts str or UTF-8 bytes.
+
+    Results are memoized on a content hash so tool pipelines that pass
+    the same KML through validate/convert/extract calls parse it once.
+    """
+    kml_bytes = kml_content.encode('utf-8') if isinstance(kml_content, str) else kml_content
+    key = (
+        hashlib.blake2b(kml_bytes, digest_size=16).digest(),
+        extract_styles,
+        include_metadata,
+        wanted_types,
+    )
+
+    with _parse_cache_lock:
+        cached = _parse_cache.get(key)
+        if cached is not None:
+            _parse_cache.move_to_end(key)
+            return cached
+
+    result = None
+    if len(kml_bytes) >= _PARALLEL_THRESHOLD_BYTES:
+        result = _parse_kml_file_parallel(
+            kml_bytes, extract_styles, include_metadata, wanted_types)
+
+    if result is None:
+        if LET is not None:
+            result = _parse_kml_file_internal_lxml(
+                kml_bytes, extract_styles, include_metadata, wanted_types)
+        else:
+            result = _parse_kml_file_internal_et(
+                kml_bytes, extract_styles, include_metadata, wanted_types)
+
+    if result.get('success'):
+        with _parse_cache_lock:
+            _parse_cache[key] = result
+            while len(_parse_cache) > _PARSE_CACHE_SIZE:
+                _parse_cache.popitem(last=False)
+
+    return result
+
+
 @gis_mcp.tool()
 def parse_kml_file(
     kml_content: str,
@@ -169,68 +602,91 @@ def parse_kml_file(
     return _parse_kml_file_internal(kml_content, extract_styles, include_metadata)
 
 
-def _parse_placemark(placemark: ET.Element, include_metadata: bool) -> Optional[Dict[str, Any]]:
-    """Parse a KML Placemark element."""
+def _parse_placemark(
+    placemark: ET.Element,
+    include_metadata: bool,
+    wanted_types: Optional[frozenset] = None
+) -> Optional[Dict[str, Any]]:
+    """Parse a KML Placemark element.
+
+    When wanted_types is given, placemarks of any other geometry type are
+    discarded before their coordinates are parsed.
+    """
     try:
-        # Extract name and description
-        name_elem = placemark.find('kml:name', KML_NS)
-        desc_elem = placemark.find('kml:description', KML_NS)
-
-        name = name_elem.text if name_elem is not None else None
-        description = desc_elem.text if desc_elem is not None else None
-
-        # Extract geometry
-        point = placemark.find('.//kml:Point/kml:coordinates', KML_NS)
-        linestring = placemark.find('.//kml:LineString/kml:coordinates', KML_NS)
-        polygon = placemark.find('.//kml:Polygon/kml:outerBoundaryIs/kml:LinearRing/kml:coordinates', KML_NS)
-
-        geometry = None
-        geometry_type = None
-        coordinates = None
-
-        if point is not None:
-            geometry_type = "Point"
-            coords = _parse_coordinates(point.text)
-            if coords:
-                coordinates = coords[0]
-                geometry = Point(coordinates[:2])  # lon, lat
-
-        elif linestring is not None:
-            geometry_type = "LineString"
-            coords = _parse_coordinates(linestring.text)
-            if coords:
-                coordinates = coords
-                geometry = LineString([(c[0], c[1]) for c in coords])
-
-        elif polygon is not None:
-            geometry_type = "Polygon"
-            coords = _parse_coordinates(polygon.text)
-            if coords:
-                coordinates = coords
-                geometry = Polygon([(c[0], c[1]) for c in coords])
-
-        if geometry is None:
+        name = None
+        description = None
+        point_text = None
+        line_text = None
+        poly_text = None
+        extended_data = {}
+
+        # Single walk over the placemark subtree, branching on the
+        # precomputed Clark-notation tags, instead of one DFS per find().
+        # geom_context tracks which geometry container the current
+        # coordinates element belongs to.
+        geom_context = None
+        in_outer_boundary = False
+
+        for elem in placemark.iter():
+            tag = elem.tag
+            if tag == _TAG_NAME:
+                if name is None:
+                    name = elem.text
+            elif tag == _TAG_DESC:
+                if description is None:
+                    description = elem.text
+            elif tag in (_TAG_POINT, _TAG_LINESTRING, _TAG_POLYGON):
+                geom_context = tag
+                in_outer_boundary = False
+            elif tag == _TAG_OUTER_BOUNDARY:
+                in_outer_boundary = True
+            elif tag == _TAG_INNER_BOUNDARY:
+                in_outer_boundary = False
+            elif tag == _TAG_COORDINATES:
+                if geom_context == _TAG_POINT and point_text is None:
+                    point_text = elem.text
+                elif geom_context == _TAG_LINESTRING and line_text is None:
+                    line_text = elem.text
+                elif geom_context == _TAG_POLYGON and in_outer_boundary and poly_text is None:
+                    poly_text = elem.text
+            elif include_metadata and tag == _TAG_DATA:
+                data_name = elem.get('name')
+                value_elem = elem.find(_TAG_VALUE)
+                if data_name and value_elem is not None:
+                    # ExtendedData schemas repeat across placemarks, so
+                    # intern the key strings to share them
+                    extended_data[sys.intern(data_name)] = value_elem.text
+
+        if point_text is not None:
+            geometry_type, coord_text = "Point", point_text
+        elif line_text is not None:
+            geometry_type, coord_text = "LineString", line_text
+        elif poly_text is not None:
+            geometry_type, coord_text = "Polygon", poly_text
+        else:
+            return None
+
+        # Discard unwanted geometry types before paying for the
+        # coordinate parse
+        if wanted_types is not None and geometry_type not in wanted_types:
+            return None
+
+        coords = _parse_coordinates(coord_text)
+        if not coords:
             return None
 
+        coordinates = coords[0] if geometry_type == "Point" else coords
+
         feature = {
             "name": name,
             "description": description,
             "geometry_type": geometry_type,
-            "geometry_wkt": geometry.wkt,
+            "geometry_wkt": _coords_to_wkt(geometry_type, coordinates),
             "coordinates": coordinates
         }
 
-        # Extract extended data if requested
-        if include_metadata:
-            extended_data = {}
-            for data_elem in placemark.findall('.//kml:ExtendedData/kml:Data', KML_NS):
-                data_name = data_elem.get('name')
-                value_elem = data_elem.find('kml:value', KML_NS)
-                if data_name and value_elem is not None:
-                    extended_data[data_name] = value_elem.text
-
-            if extended_data:
-                feature["extended_data"] = extended_data
+        if include_metadata and extended_data:
+            feature["extended_data"] = extended_data
 
         return feature
 
@@ -239,44 +695,105 @@ def _parse_placemark(placemark: ET.Element, include_metadata: bool) -> Optional[
         return None
 
 
+def _coords_to_wkt(geometry_type: str, coordinates: List) -> str:
+    """Build a WKT string straight from parsed coordinate lists.
+
+    Avoids allocating a Shapely geometry whose only purpose is its .wkt
+    property. Polygons get their outer ring closed if the KML ring is open.
+    """
+    if geometry_type == "Point":
+        return f"POINT ({coordinates[0]} {coordinates[1]})"
+
+    pairs = ", ".join(f"{c[0]} {c[1]}" for c in coordinates)
+    if geometry_type == "LineString":
+        return f"LINESTRING ({pairs})"
+    if geometry_type == "Polygon":
+        first, last = coordinates[0], coordinates[-1]
+        if first[0] != last[0] or first[1] != last[1]:
+            pairs += f", {first[0]} {first[1]}"
+        return f"POLYGON (({pairs}))"
+    raise ValueError(f"Unsupported geometry type: {geometry_type}")
+
+
 def _parse_coordinates(coord_text: str) -> List[List[float]]:
     """Parse KML coordinate string."""
+    if not coord_text:
+        return []
+
+    first_tuple = coord_text.split(None, 1)[0] if coord_text.strip() else ''
+    if not first_tuple:
+        return []
+
+    # Fast path: uniform lon,lat[,elev] tuples parse as one flat NumPy
+    # array (C-level float conversion) and a reshape. Tuple width is taken
+    # from the first tuple and uniformity is verified from the total comma
+    # count, so the text is tokenized only once. Anything irregular falls
+    # through to the per-tuple loop below.
+    width = first_tuple.count(',') + 1
+    if width in (2, 3):
+        try:
+            flat = np.array(coord_text.replace(',', ' ').split(), dtype=np.float64)
+        except ValueError:
+            flat = None
+        if flat is not None and flat.size * (width - 1) == coord_text.count(',') * width \
+                and flat.size % width == 0:
+            arr = flat.reshape(-1, width)
+            if width == 2:
+                arr = np.hstack([arr, np.zeros((arr.shape[0], 1))])
+            return arr.tolist()
+
     coords = []
-    if coord_text:
-        for coord_str in coord_text.strip().split():
-            parts = coord_str.split(',')
-            if len(parts) >= 2:
-                lon = float(parts[0])
-                lat = float(parts[1])
-                elev = float(parts[2]) if len(parts) > 2 else 0.0
-                coords.append([lon, lat, elev])
+    for coord_str in coord_text.split():
+        parts = coord_str.split(',')
+        if len(parts) >= 2:
+            lon = float(parts[0])
+            lat = float(parts[1])
+            elev = float(parts[2]) if len(parts) > 2 else 0.0
+            coords.append([lon, lat, elev])
     return coords
 
 
+# Flyweight cache for extracted style dicts: large KMLs commonly repeat
+# identical line/icon styles under different ids, so identical contents
+# share one dict instead of allocating per Style element.
+_STYLE_CACHE_SIZE = 256
+_style_cache: Dict[tuple, Dict[str, Any]] = {}
+
+
 def _extract_style_info(style_elem: ET.Element) -> Dict[str, Any]:
     """Extract style information from Style element."""
     style_info = {}
 
     # Line style
-    line_style = style_elem.find('kml:LineStyle', KML_NS)
+    line_style = style_elem.find(_TAG_LINE_STYLE)
     if line_style is not None:
-        color = line_style.find('kml:color', KML_NS)
-        width = line_style.find('kml:width', KML_NS)
+        color = line_style.find(_TAG_COLOR)
+        width = line_style.find(_TAG_WIDTH)
         style_info['line'] = {
             'color': color.text if color is not None else None,
             'width': float(width.text) if width is not None else 1.0
         }
 
     # Icon style
-    icon_style = style_elem.find('kml:IconStyle', KML_NS)
+    icon_style = style_elem.find(_TAG_ICON_STYLE)
     if icon_style is not None:
-        icon = icon_style.find('kml:Icon/kml:href', KML_NS)
-        scale = icon_style.find('kml:scale', KML_NS)
+        icon = icon_style.find(_TAG_ICON_HREF)
+        scale = icon_style.find(_TAG_SCALE)
         style_info['icon'] = {
             'href': icon.text if icon is not None else None,
             'scale': float(scale.text) if scale is not None else 1.0
         }
 
+    key = tuple(
+        (kind, tuple(sorted(attrs.items())))
+        for kind, attrs in sorted(style_info.items())
+    )
+    cached = _style_cache.get(key)
+    if cached is not None:
+        return cached
+    if len(_style_cache) >= _STYLE_CACHE_SIZE:
+        _style_cache.clear()
+    _style_cache[key] = style_info
     return style_info
 
 
@@ -292,42 +809,42 @@ def extract_kmz(
 
     Args:
         kmz_path: Path to KMZ file
-        output_dir: Optional directory for extraction (uses temp dir if not specified)
+        output_dir: Optional directory for extraction. When omitted, the
+            main KML is read straight from the archive and nothing is
+            written to disk.
 
     Returns:
         Dictionary containing:
         - kml_content: Main KML file content as string
         - kml_filename: Name of main KML file
-        - extracted_files: List of all extracted files
-        - extraction_path: Path to extracted directory
+        - extracted_files: List of files in the archive
+        - extraction_path: Path to extracted directory (None if not extracted)
 
     Example:
         >>> extract_kmz("/path/to/transmission_line.kmz")
         {'kml_content': '<?xml version...', 'extracted_files': [...], ...}
     """
     try:
-        # Use temp directory if output_dir not specified
-        if output_dir is None:
-            output_dir = tempfile.mkdtemp(prefix="kmz_extract_")
-
-        # Extract KMZ (which is a ZIP file)
         with zipfile.ZipFile(kmz_path, 'r') as zip_ref:
-            zip_ref.extractall(output_dir)
             extracted_files = zip_ref.namelist()
 
-        # Find main KML file (usually doc.kml or the first .kml file)
-        kml_files = [f for f in extracted_files if f.lower().endswith('.kml')]
+            # Find main KML file (usually doc.kml or the first .kml file)
+            kml_files = [f for f in extracted_files if f.lower().endswith('.kml')]
 
-        if not kml_files:
-            raise ValueError("No KML file found in KMZ archive")
+            if not kml_files:
+                raise ValueError("No KML file found in KMZ archive")
 
-        # Prefer doc.kml, otherwise use first KML file
-        main_kml = 'doc.kml' if 'doc.kml' in kml_files else kml_files[0]
-        kml_path = os.path.join(output_dir, main_kml)
+            # Prefer doc.kml, otherwise use first KML file
+            main_kml = 'doc.kml' if 'doc.kml' in kml_files else kml_files[0]
+
+            # Read the main KML straight from the archive; supporting
+            # files (icons, overlays) are only written to disk when the
+            # caller asked for an extraction directory.
+            with zip_ref.open(main_kml) as f:
+                kml_content = f.read().decode('utf-8', errors='replace')
 
-        # Read KML content
-        with open(kml_path, 'r', encoding='utf-8') as f:
-            kml_content = f.read()
+            if output_dir is not None:
+                zip_ref.extractall(output_dir)
 
         return {
             "success": True,
@@ -349,6 +866,71 @@ def extract_kmz(
         raise ValueError(f"KMZ extraction failed: {str(e)}")
 
 
+@gis_mcp.tool()
+def parse_kmz(
+    kmz_path: str,
+    extract_styles: bool = True,
+    include_metadata: bool = True
+) -> Dict[str, Any]:
+    """Parse the main KML inside a KMZ archive without decompressing it.
+
+    Unlike chaining extract_kmz with parse_kml_file, which materializes
+    the whole KML document as a string between the two calls, this tool
+    feeds the compressed archive entry straight into the streaming XML
+    parser, so peak memory stays bounded even for very large archives.
+
+    Args:
+        kmz_path: Path to KMZ file
+        extract_styles: Whether to extract style information
+        include_metadata: Whether to include extended data and descriptions
+
+    Returns:
+        Same structure as parse_kml_file, plus:
+        - kml_filename: Name of the main KML file inside the archive
+
+    Example:
+        >>> parse_kmz("/path/to/transmission_line.kmz")
+        {'features': [...], 'feature_count': 45, 'kml_filename': 'doc.kml', ...}
+    """
+    zf = None
+    try:
+        zf = zipfile.ZipFile(kmz_path, 'r')
+        kml_files = [f for f in zf.namelist() if f.lower().endswith('.kml')]
+
+        if not kml_files:
+            raise ValueError("No KML file found in KMZ archive")
+
+        main_kml = 'doc.kml' if 'doc.kml' in kml_files else kml_files[0]
+
+        # Each pass gets its own decompressing stream over the archive
+        # entry, so the full document never exists in memory at once.
+        def open_source():
+            return zf.open(main_kml)
+
+        if LET is not None:
+            result = _parse_kml_source_lxml(
+                open_source, extract_styles, include_metadata)
+        else:
+            result = _parse_kml_source_et(
+                open_source, extract_styles, include_metadata)
+
+        result["kml_filename"] = main_kml
+        return result
+
+    except zipfile.BadZipFile:
+        logger.error(f"Invalid KMZ file: {kmz_path}")
+        return {
+            "success": False,
+            "error": "Invalid KMZ file (not a valid ZIP archive)"
+        }
+    except Exception as e:
+        logger.error(f"Error parsing KMZ: {str(e)}")
+        raise ValueError(f"KMZ parsing failed: {str(e)}")
+    finally:
+        if zf is not None:
+            zf.close()
+
+
 @gis_mcp.tool()
 def validate_transmission_line_kml(
     kml_content: str,
@@ -400,30 +982,37 @@ def validate_transmission_line_kml(
         if require_tower_points and geometry_types.get('Point', 0) == 0:
             errors.append("No Point features found (required for tower locations)")
 
-        # Check for coordinate validity
+        # Check coordinate validity and elevation presence over a single
+        # contiguous coordinate block (SoA) instead of per-feature arrays
+        with_coords = []
         for feature in features:
-            coords = feature.get('coordinates', [])
-            if not coords:
+            if feature.get('coordinates'):
+                with_coords.append(feature)
+            else:
                 warnings.append(f"Feature '{feature.get('name')}' has no coordinates")
-                continue
 
-            # Validate coordinate ranges
-            if isinstance(coords, list) and isinstance(coords[0], list):
-                # Multiple coordinates
-                for coord in coords:
-                    if not _validate_coordinate(coord):
-                        errors.append(f"Invalid coordinate in feature '{feature.get('name')}': {coord}")
-            else:
-                # Single coordinate
-                if not _validate_coordinate(coords):
-                    errors.append(f"Invalid coordinate in feature '{feature.get('name')}': {coords}")
-
-        # Check for elevation data
-        has_elevation = any(
-            len(coord) > 2 and coord[2] != 0
-            for feature in features
-            for coord in (feature.get('coordinates', []) if isinstance(feature.get('coordinates', [])[0] if feature.get('coordinates') else [], list) else [feature.get('coordinates', [])])
-        )
+        has_elevation = False
+        if with_coords:
+            soa = _features_to_arrays(with_coords)
+            coords_block = soa['coords']
+            offsets = soa['offsets']
+
+            valid_mask = (
+                (coords_block[:, 0] >= -180) & (coords_block[:, 0] <= 180)
+                & (coords_block[:, 1] >= -90) & (coords_block[:, 1] <= 90)
+            )
+            if not valid_mask.all():
+                bad_rows = np.nonzero(~valid_mask)[0]
+                owners = np.searchsorted(offsets, bad_rows, side='right') - 1
+                for bad, owner in zip(bad_rows, owners):
+                    feature = with_coords[owner]
+                    coords = feature['coordinates']
+                    coord = coords if not isinstance(coords[0], list) \
+                        else coords[bad - offsets[owner]]
+                    errors.append(
+                        f"Invalid coordinate in feature '{feature.get('name')}': {coord}")
+
+            has_elevation = bool(np.any(coords_block[:, 2] != 0))
 
         if not has_elevation:
             warnings.append("No elevation data found in coordinates (z-values are 0 or missing)")
@@ -470,7 +1059,8 @@ def _validate_coordinate(coord: List[float]) -> bool:
 @gis_mcp.tool()
 def convert_kml_to_geojson(
     kml_content: str,
-    include_styles: bool = False
+    include_styles: bool = False,
+    return_string: bool = False
 ) -> Dict[str, Any]:
     """Convert KML features to GeoJSON format.
 
@@ -480,12 +1070,15 @@ def convert_kml_to_geojson(
     Args:
         kml_content: KML file content as string
         include_styles: Whether to include style info in properties
+        return_string: Whether to also serialize the FeatureCollection
+            into the geojson_string field
 
     Returns:
         Dictionary containing:
         - geojson: GeoJSON FeatureCollection object
         - feature_count: Number of features converted
         - conversion_success: Boolean success indicator
+        - geojson_string: Serialized GeoJSON if return_string=True
 
     Example:
         >>> convert_kml_to_geojson(kml_string)
@@ -507,9 +1100,25 @@ def convert_kml_to_geojson(
         geojson_features = []
 
         for feature in features:
-            # Create GeoJSON geometry
-            geom = wkt.loads(feature['geometry_wkt'])
-            geojson_geom = mapping(geom)
+            # Create GeoJSON geometry straight from the parsed coordinate
+            # lists (2D, matching the previous shapely mapping() output)
+            geometry_type = feature['geometry_type']
+            coords = feature['coordinates']
+
+            if geometry_type == "Point":
+                geo_coords = list(coords[:2])
+            elif geometry_type == "LineString":
+                geo_coords = [list(c[:2]) for c in coords]
+            else:  # Polygon
+                ring = [list(c[:2]) for c in coords]
+                if ring[0] != ring[-1]:
+                    ring.append(list(ring[0]))
+                geo_coords = [ring]
+
+            geojson_geom = {
+                "type": geometry_type,
+                "coordinates": geo_coords
+            }
 
             # Create properties
             properties = {
@@ -536,13 +1145,23 @@ def convert_kml_to_geojson(
             "features": geojson_features
         }
 
-        return {
+        result = {
             "conversion_success": True,
             "geojson": geojson,
-            "feature_count": len(geojson_features),
-            "geojson_string": json.dumps(geojson, indent=2)
+            "feature_count": len(geojson_features)
         }
 
+        # Serialize only on request; every caller used to pay for the
+        # indented dump even when it only wanted the dict
+        if return_string:
+            if orjson is not None:
+                result["geojson_string"] = orjson.dumps(
+                    geojson, option=orjson.OPT_INDENT_2).decode()
+            else:
+                result["geojson_string"] = json.dumps(geojson, indent=2)
+
+        return result
+
     except Exception as e:
         logger.error(f"Error converting KML to GeoJSON: {str(e)}")
         raise ValueError(f"KML to GeoJSON conversion failed: {str(e)}")
@@ -573,10 +1192,13 @@ def extract_tower_locations(
         {'towers': [...], 'tower_count': 23, ...}
     """
     try:
-        import re
+        # Compile the name filter once instead of re-matching the raw
+        # pattern string inside the per-feature loop
+        name_regex = re.compile(name_pattern) if name_pattern else None
 
-        # Parse KML
-        parse_result = _parse_kml_file_internal(kml_content, False, True)
+        # Parse KML, skipping non-Point placemarks entirely
+        parse_result = _parse_kml_file_internal(
+            kml_content, False, True, wanted_types=frozenset({'Point'}))
 
         if not parse_result.get('success'):
             return {
@@ -590,36 +1212,39 @@ def extract_tower_locations(
 
         # Filter Point features
         towers = []
+        lonlat_pairs = []
         for feature in features:
             if feature['geometry_type'] != 'Point':
                 continue
 
             # Apply name filter if specified
-            if name_pattern:
-                name = feature.get('name', '')
-                if not re.match(name_pattern, name):
+            if name_regex is not None:
+                if not name_regex.match(feature.get('name') or ''):
                     continue
 
+            coordinates = feature['coordinates']
             towers.append({
                 "name": feature.get('name'),
-                "coordinates": feature['coordinates'],
-                "longitude": feature['coordinates'][0],
-                "latitude": feature['coordinates'][1],
-                "elevation": feature['coordinates'][2] if len(feature['coordinates']) > 2 else None,
+                "coordinates": coordinates,
+                "longitude": coordinates[0],
+                "latitude": coordinates[1],
+                "elevation": coordinates[2] if len(coordinates) > 2 else None,
                 "description": feature.get('description'),
                 "extended_data": feature.get('extended_data', {})
             })
+            lonlat_pairs.append(coordinates[:2])
 
-        # Calculate bounding box
+        # Calculate bounding box in a single vectorized pass
         bounding_box = None
-        if towers:
-            lons = [t['longitude'] for t in towers]
-            lats = [t['latitude'] for t in towers]
+        if lonlat_pairs:
+            arr = np.asarray(lonlat_pairs, dtype=np.float64)
+            mn = arr.min(axis=0)
+            mx = arr.max(axis=0)
             bounding_box = {
-                "min_lon": min(lons),
-                "max_lon": max(lons),
-                "min_lat": min(lats),
-                "max_lat": max(lats)
+                "min_lon": float(mn[0]),
+                "max_lon": float(mx[0]),
+                "min_lat": float(mn[1]),
+                "max_lat": float(mx[1])
             }
 
         return {
@@ -660,10 +1285,13 @@ def extract_line_routes(
         {'routes': [...], 'route_count': 3, ...}
     """
     try:
-        import re
+        # Compile the name filter once instead of re-matching the raw
+        # pattern string inside the per-feature loop
+        name_regex = re.compile(name_pattern) if name_pattern else None
 
-        # Parse KML
-        parse_result = _parse_kml_file_internal(kml_content, False, True)
+        # Parse KML, skipping non-LineString placemarks entirely
+        parse_result = _parse_kml_file_internal(
+            kml_content, False, True, wanted_types=frozenset({'LineString'}))
 
         if not parse_result.get('success'):
             return {
@@ -676,29 +1304,35 @@ def extract_line_routes(
         features = parse_result['features']
 
         # Filter LineString features
-        routes = []
-        total_length = 0.0
-
+        selected = []
         for feature in features:
             if feature['geometry_type'] != 'LineString':
                 continue
 
             # Apply name filter if specified
-            if name_pattern:
-                name = feature.get('name', '')
-                if not re.match(name_pattern, name):
+            if name_regex is not None:
+                if not name_regex.match(feature.get('name') or ''):
                     continue
 
-            # Calculate route length
-            geom = wkt.loads(feature['geometry_wkt'])
-            route_length = geom.length  # in degrees
-            total_length += route_length
+            selected.append(feature)
+
+        # One vectorized length pass over all routes instead of a
+        # Shapely round-trip per feature
+        if selected:
+            soa = _features_to_arrays(selected)
+            lengths_deg, lengths_km = _linestring_lengths_vec(
+                soa['coords'], soa['offsets'])
+        else:
+            lengths_deg = lengths_km = np.zeros(0)
 
+        routes = []
+        for feature, length_deg, length_km in zip(selected, lengths_deg, lengths_km):
             routes.append({
                 "name": feature.get('name'),
                 "coordinates": feature['coordinates'],
                 "geometry_wkt": feature['geometry_wkt'],
-                "length_degrees": round(route_length, 6),
+                "length_degrees": round(float(length_deg), 6),
+                "length_km": round(float(length_km), 3),
                 "vertex_count": len(feature['coordinates']),
                 "description": feature.get('description'),
                 "extended_data": feature.get('extended_data', {})
@@ -708,7 +1342,8 @@ def extract_line_routes(
             "success": True,
             "routes": routes,
             "route_count": len(routes),
-            "total_length_degrees": round(total_length, 6),
+            "total_length_degrees": round(float(lengths_deg.sum()), 6),
+            "total_length_km": round(float(lengths_km.sum()), 3),
             "name_filter_applied": name_pattern is not None
         }
 
@@ -7,22 +7,91 @@ ShadowSpan operations console.
 import os
 import logging
 import math
+from functools import lru_cache
 from typing import Any, Dict, List, Optional, Tuple
 from .mcp import gis_mcp
 
 # Configure logging
 logger = logging.getLogger(__name__)
 
+# Cap on obstruction indices reported by analyze_line_of_sight
+_MAX_OBSTRUCTION_INDICES = 20
+
+# Convention: scalar per-span tools (calculate_conductor_sag, the
+# single-pair span path) use math.*, the batched/array paths use np.*.
+# math functions are several times faster than NumPy ufuncs on single
+# floats; ufuncs only win once the inputs are arrays.
+
 # Import required libraries
 try:
-    from shapely import wkt
+    import shapely
     from shapely.geometry import Point, LineString, Polygon, MultiPoint
-    from shapely.ops import nearest_points
+    from shapely.ops import transform as shapely_transform
+    from pyproj import Geod, Transformer
     import numpy as np
 except ImportError as e:
     logger.error(f"Required dependencies not available: {e}")
     raise
 
+# Shared WGS84 geodesic solver; constructing one per call is wasted work
+_WGS84_GEOD = Geod(ellps='WGS84')
+
+# Optional numba acceleration for the per-span numeric kernels; the
+# NumPy paths below remain the fallback when numba is not installed.
+try:
+    import numba
+except ImportError:
+    numba = None
+
+if numba is not None:
+    @numba.njit(cache=True, fastmath=True)
+    def _catenary_kernel(span_length, sag, catenary_constant, num_points):
+        """Fused catenary points + arc length in a single compiled loop."""
+        x = np.linspace(0.0, span_length, num_points)
+        y = np.empty(num_points, dtype=np.float64)
+        half = span_length / 2.0
+        if catenary_constant > 0:
+            for i in range(num_points):
+                y[i] = catenary_constant * (
+                    np.cosh((x[i] - half) / catenary_constant) - 1.0) - sag
+        else:
+            k = 4.0 * sag / (span_length * span_length)
+            for i in range(num_points):
+                y[i] = k * x[i] * (span_length - x[i]) - sag
+        length = 0.0
+        for i in range(num_points - 1):
+            length += np.hypot(x[i + 1] - x[i], y[i + 1] - y[i])
+        return x, y, length
+
+    @numba.njit(cache=True, fastmath=True)
+    def _los_any_obstruction(elev1, elev2, terrain):
+        """Early-exit obstruction test: returns on the first hit."""
+        n = terrain.size
+        step = (elev2 - elev1) / (n - 1) if n > 1 else 0.0
+        for i in range(n):
+            if elev1 + step * i < terrain[i]:
+                return True
+        return False
+
+    @numba.njit(cache=True, fastmath=True)
+    def _los_kernel(elev1, elev2, terrain):
+        """Min clearance and obstruction count in one pass over terrain."""
+        n = terrain.size
+        step = (elev2 - elev1) / (n - 1) if n > 1 else 0.0
+        min_clear = np.inf
+        count = 0
+        for i in range(n):
+            clearance = elev1 + step * i - terrain[i]
+            if clearance < min_clear:
+                min_clear = clearance
+            if clearance < 0:
+                count += 1
+        return min_clear, count
+else:
+    _catenary_kernel = None
+    _los_kernel = None
+    _los_any_obstruction = None
+
 
 # Resource handlers for Transmission Line operations
 @gis_mcp.resource("gis://transmission/operations")
@@ -32,8 +101,11 @@ def get_transmission_operations() -> Dict[str, List[str]]:
         "operations": [
             "calculate_conductor_sag",
             "calculate_span_length",
+            "calculate_span_lengths_batch",
             "analyze_tower_placement",
             "check_clearance",
+            "check_clearance_many",
+            "check_clearances_against_tree",
             "create_row_buffer",
             "calculate_catenary_curve",
             "calculate_structure_offsets",
@@ -82,22 +154,23 @@ def calculate_conductor_sag(
         if wind_pressure:
             # Simplified wind load calculation (assuming conductor diameter ~30mm)
             conductor_diameter = 0.03  # meters
-            wind_load = wind_pressure * conductor_diameter  # N/m
-            effective_weight = math.sqrt(conductor_weight**2 + (wind_load/9.81)**2)
+            wind_load_weight = wind_pressure * conductor_diameter / 9.81  # kg/m
+            effective_weight = math.hypot(conductor_weight, wind_load_weight)
 
-        # Catenary constant
-        catenary_constant = tension / (effective_weight * 9.81)  # meters
+        # Catenary constant; this kernel runs once per span in route
+        # planning, so intermediates are shared rather than recomputed
+        weight_per_meter = effective_weight * 9.81  # N/m
+        catenary_constant = tension / weight_per_meter  # meters
 
         # Maximum sag (at midspan)
-        # Sag = (w * L^2) / (8 * T)
-        sag = (effective_weight * 9.81 * span_length**2) / (8 * tension)
+        # Sag = (w * L^2) / (8 * T) = L^2 / (8 * c)
+        sag = (span_length * span_length) / (8 * catenary_constant)
 
         # Conductor length using catenary curve
         # L = 2c * sinh(s/2c) where c = catenary constant, s = span
-        half_span = span_length / 2
         if catenary_constant > 0:
-            sinh_term = math.sinh(half_span / catenary_constant)
-            conductor_length = 2 * catenary_constant * sinh_term
+            half_span_over_c = (span_length * 0.5) / catenary_constant
+            conductor_length = 2 * catenary_constant * math.sinh(half_span_over_c)
         else:
             conductor_length = span_length
 
@@ -126,6 +199,193 @@ def calculate_conductor_sag(
         raise ValueError(f"Sag calculation failed: {str(e)}")
 
 
+@lru_cache(maxsize=1024)
+def _parse_wkt(wkt_string: str):
+    """Memoized shapely.from_wkt.
+
+    Console workloads repeatedly query the same conductor against many
+    obstacles, so caching turns N parses of the fixed geometry into one.
+    Callers must not mutate the returned geometry (none of the tools
+    here do; shapely operations return new objects).
+    """
+    return shapely.from_wkt(wkt_string)
+
+
+def _parse_wkt_array(wkts) -> "np.ndarray":
+    """Parse a list of WKT strings in one vectorized shapely call.
+
+    Bulk callers go through here instead of looping _parse_wkt so the
+    whole batch is decoded in a single C pass.
+    """
+    return shapely.from_wkt(np.asarray(wkts, dtype=object))
+
+
+@lru_cache(maxsize=64)
+def _get_transformer(lat0: float, lon0: float) -> "Transformer":
+    """WGS84 lon/lat to a local azimuthal-equidistant projection.
+
+    Working in AEQD meters makes buffers and distances metrically
+    correct at any latitude, replacing the 111320 * cos(lat)
+    degree-to-meter approximation. Keys are rounded geometry centers so
+    repeated calls on nearby geometries reuse one cached projection.
+    """
+    return Transformer.from_crs(
+        "EPSG:4326",
+        f"+proj=aeqd +lat_0={lat0} +lon_0={lon0} +datum=WGS84 +units=m",
+        always_xy=True)
+
+
+def _inverse_transform(transformer: "Transformer"):
+    """Callable mapping projected meters back to lon/lat for shapely_transform."""
+    def inverse(x, y, z=None):
+        return transformer.transform(x, y, direction="INVERSE")
+    return inverse
+
+
+def _project_geometries(geoms, transformer: "Transformer", direction: str = "FORWARD"):
+    """Project an array of geometries through one vectorized coordinate pass.
+
+    shapely.transform hands over all coordinates as a single (N, 2)
+    array, so the whole batch crosses into pyproj once.
+    """
+    def reproject(coords):
+        x, y = transformer.transform(coords[:, 0], coords[:, 1], direction=direction)
+        return np.column_stack([x, y])
+    return shapely.transform(geoms, reproject)
+
+
+def _required_clearance(minimum_clearance: float, voltage_kv: Optional[float]) -> float:
+    """Required clearance in meters (NESC standards approximation)."""
+    required = minimum_clearance
+    if voltage_kv:
+        # Basic formula: base clearance + voltage factor
+        # For 69-230 kV: ~5.5m base + 0.01m per kV over 50kV
+        if voltage_kv > 50:
+            required = 5.5 + (0.01 * (voltage_kv - 50))
+        required = max(required, minimum_clearance)
+    return required
+
+
+def _points_to_array(points: List[List[float]]) -> "np.ndarray":
+    """Stack [lon, lat(, elevation)] points into an (N, 3) float array.
+
+    Missing elevations are padded with 0 so downstream math never has to
+    branch on point arity.
+    """
+    arr = np.zeros((len(points), 3))
+    for i, point in enumerate(points):
+        arr[i, 0] = point[0]
+        arr[i, 1] = point[1]
+        if len(point) > 2:
+            arr[i, 2] = point[2]
+    return arr
+
+
+def _span_metrics(pts1: "np.ndarray", pts2: "np.ndarray") -> Dict[str, "np.ndarray"]:
+    """Geodesic span metrics over (N, 3) point arrays.
+
+    pyproj's Geod.inv accepts whole arrays, so one C call covers every
+    pair; the slant/slope/midpoint arithmetic then runs as NumPy ufuncs
+    instead of per-pair Python floats.
+    """
+    geod = _WGS84_GEOD
+    if pts1.shape[0] == 1:
+        # pyproj routes 1-element arrays through its scalar path anyway;
+        # hand it plain floats and finish with math.* per the module's
+        # scalar-vs-bulk convention
+        azimuth, back_azimuth, horizontal = geod.inv(
+            float(pts1[0, 0]), float(pts1[0, 1]),
+            float(pts2[0, 0]), float(pts2[0, 1]))
+        elevation_diff = float(pts2[0, 2] - pts1[0, 2])
+        return {
+            "horizontal": np.array([horizontal]),
+            "azimuth": np.array([azimuth]),
+            "back_azimuth": np.array([back_azimuth]),
+            "elevation_diff": np.array([elevation_diff]),
+            "slant": np.array([math.hypot(horizontal, elevation_diff)]),
+            "slope": np.array([math.degrees(math.atan2(elevation_diff, horizontal))]),
+            "midpoint": (pts1 + pts2) / 2.0
+        }
+
+    azimuth, back_azimuth, horizontal = geod.inv(
+        pts1[:, 0], pts1[:, 1], pts2[:, 0], pts2[:, 1])
+    azimuth = np.asarray(azimuth)
+    back_azimuth = np.asarray(back_azimuth)
+    horizontal = np.asarray(horizontal)
+
+    elevation_diff = pts2[:, 2] - pts1[:, 2]
+    slant = np.hypot(horizontal, elevation_diff)
+    slope = np.degrees(np.arctan2(elevation_diff, horizontal))
+
+    return {
+        "horizontal": horizontal,
+        "azimuth": azimuth,
+        "back_azimuth": back_azimuth,
+        "elevation_diff": elevation_diff,
+        "slant": slant,
+        "slope": slope,
+        "midpoint": (pts1 + pts2) / 2.0
+    }
+
+
+@gis_mcp.tool()
+def calculate_span_lengths_batch(
+    points1: List[List[float]],
+    points2: List[List[float]]
+) -> Dict[str, Any]:
+    """Calculate span lengths for many support-structure pairs at once.
+
+    Batched counterpart of calculate_span_length: all pairs go through a
+    single array call to the WGS84 geodesic solver, which is far faster
+    than one tool call per span for route-wide workloads.
+
+    Args:
+        points1: List of [longitude, latitude, elevation] or [lon, lat]
+        points2: List of [longitude, latitude, elevation] or [lon, lat],
+            same length as points1
+
+    Returns:
+        Dictionary of parallel lists, one entry per pair:
+        - horizontal_distances_meters
+        - slant_distances_meters
+        - elevation_differences_meters
+        - azimuths_degrees
+        - slope_angles_degrees
+        - midpoints: [lon, lat, elevation] per pair
+
+    Example:
+        >>> calculate_span_lengths_batch([[0, 0, 100]], [[0.005, 0, 150]])
+        {'span_count': 1, 'horizontal_distances_meters': [556.6], ...}
+    """
+    try:
+        if len(points1) != len(points2):
+            raise ValueError("points1 and points2 must have the same length")
+        if not points1:
+            raise ValueError("At least one point pair is required")
+
+        metrics = _span_metrics(_points_to_array(points1), _points_to_array(points2))
+
+        midpoints = np.column_stack([
+            metrics["midpoint"][:, 0].round(6),
+            metrics["midpoint"][:, 1].round(6),
+            metrics["midpoint"][:, 2].round(2)
+        ])
+
+        return {
+            "span_count": len(points1),
+            "horizontal_distances_meters": metrics["horizontal"].round(2).tolist(),
+            "slant_distances_meters": metrics["slant"].round(2).tolist(),
+            "elevation_differences_meters": metrics["elevation_diff"].round(2).tolist(),
+            "azimuths_degrees": metrics["azimuth"].round(2).tolist(),
+            "slope_angles_degrees": metrics["slope"].round(2).tolist(),
+            "midpoints": midpoints.tolist()
+        }
+
+    except Exception as e:
+        logger.error(f"Error calculating batched span lengths: {str(e)}")
+        raise ValueError(f"Batched span length calculation failed: {str(e)}")
+
+
 @gis_mcp.tool()
 def calculate_span_length(
     point1: List[float],
@@ -155,48 +415,29 @@ def calculate_span_length(
         {'horizontal_distance': 556.0, 'slant_distance': 558.24, ...}
     """
     try:
-        from pyproj import Geod
-
-        # Extract coordinates
-        lon1, lat1 = point1[0], point1[1]
-        lon2, lat2 = point2[0], point2[1]
-        elev1 = point1[2] if len(point1) > 2 else 0
-        elev2 = point2[2] if len(point2) > 2 else 0
+        # Single pair through the batch kernel with length-1 arrays
+        metrics = _span_metrics(
+            _points_to_array([point1]), _points_to_array([point2]))
 
-        # Calculate horizontal distance using WGS84 ellipsoid
-        geod = Geod(ellps='WGS84')
-        azimuth, back_azimuth, horizontal_distance = geod.inv(lon1, lat1, lon2, lat2)
-
-        # Calculate elevation difference
-        elevation_diff = elev2 - elev1
-
-        # Calculate slant distance (3D)
-        slant_distance = None
-        slope_angle = 0.0
-        if include_elevation and len(point1) > 2 and len(point2) > 2:
-            slant_distance = math.sqrt(horizontal_distance**2 + elevation_diff**2)
-            slope_angle = math.degrees(math.atan2(elevation_diff, horizontal_distance))
-
-        # Calculate midpoint
-        midpoint_lon = (lon1 + lon2) / 2
-        midpoint_lat = (lat1 + lat2) / 2
-        midpoint_elev = (elev1 + elev2) / 2
+        midpoint = metrics["midpoint"][0]
 
         result = {
-            "horizontal_distance_meters": round(horizontal_distance, 2),
-            "elevation_difference_meters": round(elevation_diff, 2),
-            "azimuth_degrees": round(azimuth, 2),
-            "back_azimuth_degrees": round(back_azimuth, 2),
+            "horizontal_distance_meters": round(float(metrics["horizontal"][0]), 2),
+            "elevation_difference_meters": round(float(metrics["elevation_diff"][0]), 2),
+            "azimuth_degrees": round(float(metrics["azimuth"][0]), 2),
+            "back_azimuth_degrees": round(float(metrics["back_azimuth"][0]), 2),
             "midpoint": {
-                "longitude": round(midpoint_lon, 6),
-                "latitude": round(midpoint_lat, 6),
-                "elevation": round(midpoint_elev, 2)
+                "longitude": round(float(midpoint[0]), 6),
+                "latitude": round(float(midpoint[1]), 6),
+                "elevation": round(float(midpoint[2]), 2)
             }
         }
 
-        if slant_distance:
-            result["slant_distance_meters"] = round(slant_distance, 2)
-            result["slope_angle_degrees"] = round(slope_angle, 2)
+        if include_elevation and len(point1) > 2 and len(point2) > 2:
+            slant_distance = float(metrics["slant"][0])
+            if slant_distance:
+                result["slant_distance_meters"] = round(slant_distance, 2)
+                result["slope_angle_degrees"] = round(float(metrics["slope"][0]), 2)
 
         return result
 
@@ -211,7 +452,8 @@ def analyze_tower_placement(
     typical_span: float = 300.0,
     min_span: float = 200.0,
     max_span: float = 500.0,
-    terrain_elevations: Optional[List[float]] = None
+    terrain_elevations: Optional[List[float]] = None,
+    return_arrays: bool = False
 ) -> Dict[str, Any]:
     """Analyze optimal tower placement along a transmission line route.
 
@@ -224,6 +466,9 @@ def analyze_tower_placement(
         min_span: Minimum allowable span (meters)
         max_span: Maximum allowable span (meters)
         terrain_elevations: Optional list of elevations along route
+        return_arrays: When True, tower_positions is returned as
+            column-oriented {'x': [...], 'y': [...]} float32 lists, which
+            is far more compact for long routes
 
     Returns:
         Dictionary containing:
@@ -239,20 +484,20 @@ def analyze_tower_placement(
     """
     try:
         # Parse the route geometry
-        line = wkt.loads(route_line)
+        line = _parse_wkt(route_line)
 
         if not isinstance(line, LineString):
             raise ValueError("Route must be a LineString geometry")
 
-        # Get total length (in degrees, approximate)
-        total_length_deg = line.length
-
-        # Convert to approximate meters (at equator: 1 degree ≈ 111,320 meters)
-        # This is a rough approximation; for precise work, use pyproj
-        coords = list(line.coords)
-        avg_lat = sum(c[1] for c in coords) / len(coords)
-        meters_per_degree = 111320 * math.cos(math.radians(avg_lat))
-        total_length = total_length_deg * meters_per_degree
+        # Project once to a local AEQD and measure in meters, instead of
+        # scaling degree lengths by 111320 * cos(lat). One
+        # get_coordinates call feeds both the mean center and the
+        # projection, with no tuple-of-tuples materialization.
+        coords_xy = shapely.get_coordinates(line)
+        avg_lon, avg_lat = (float(v) for v in coords_xy.mean(axis=0))
+        transformer = _get_transformer(round(avg_lat, 2), round(avg_lon, 2))
+        x_m, y_m = transformer.transform(coords_xy[:, 0], coords_xy[:, 1])
+        total_length = float(np.hypot(np.diff(x_m), np.diff(y_m)).sum())
 
         # Calculate number of spans
         num_spans = int(total_length / typical_span)
@@ -273,19 +518,30 @@ def analyze_tower_placement(
         # Number of towers = number of spans + 1 (including start and end)
         tower_count = num_spans + 1
 
-        # Generate tower positions along the line
-        tower_positions = []
-        span_lengths = []
-
-        for i in range(tower_count):
-            # Interpolate position along line (0 to 1)
-            fraction = i / num_spans if num_spans > 0 else 0
-            point = line.interpolate(fraction, normalized=True)
-            tower_positions.append([round(point.x, 6), round(point.y, 6)])
-
-            # Calculate span length (except for last tower)
-            if i < tower_count - 1:
-                span_lengths.append(round(actual_span_length, 2))
+        # Generate tower positions along the line. Tower locations are
+        # linear interpolations over cumulative arc length, so one
+        # np.interp per axis replaces a GEOS interpolate() call per
+        # tower; coords_xy from above is reused rather than extracting
+        # the coordinates from GEOS a second time.
+        seg = np.diff(coords_xy, axis=0)
+        seg_len = np.hypot(seg[:, 0], seg[:, 1])
+        cum = np.concatenate(([0.0], np.cumsum(seg_len)))
+        targets = np.linspace(0.0, cum[-1], tower_count)
+        lons = np.interp(targets, cum, coords_xy[:, 0])
+        lats = np.interp(targets, cum, coords_xy[:, 1])
+
+        # Round once in C on the whole array; the spans are all equal so
+        # the list needs no per-tower loop either
+        if return_arrays:
+            # Column-oriented layout: two flat float32 columns instead of
+            # a list object plus two boxed floats per tower
+            tower_positions = {
+                "x": lons.round(6).astype(np.float32).tolist(),
+                "y": lats.round(6).astype(np.float32).tolist()
+            }
+        else:
+            tower_positions = np.stack([lons, lats], axis=1).round(6).tolist()
+        span_lengths = [round(actual_span_length, 2)] * num_spans
 
         return {
             "tower_count": tower_count,
@@ -338,29 +594,35 @@ def check_clearance(
     """
     try:
         # Parse geometries
-        conductor = wkt.loads(conductor_line)
-        obstacle = wkt.loads(obstacle_geometry)
-
-        # Calculate required clearance based on voltage (NESC standards approximation)
-        required_clearance = minimum_clearance
-        if voltage_kv:
-            # Basic formula: base clearance + voltage factor
-            # For 69-230 kV: ~5.5m base + 0.01m per kV over 50kV
-            if voltage_kv > 50:
-                required_clearance = 5.5 + (0.01 * (voltage_kv - 50))
-            required_clearance = max(required_clearance, minimum_clearance)
-
-        # Calculate minimum distance
-        min_distance = conductor.distance(obstacle)
-
-        # Find nearest points
-        nearest_pair = nearest_points(conductor, obstacle)
-        nearest_on_conductor = nearest_pair[0]
-        nearest_on_obstacle = nearest_pair[1]
-
-        # Convert distance to meters (rough approximation)
-        # In reality, you'd use pyproj for accurate distance
-        min_distance_meters = min_distance * 111320  # Rough degree-to-meter conversion
+        conductor = _parse_wkt(conductor_line)
+        obstacle = _parse_wkt(obstacle_geometry)
+
+        # Calculate required clearance based on voltage
+        required_clearance = _required_clearance(minimum_clearance, voltage_kv)
+
+        # Project both geometries to a local AEQD once so distance comes
+        # back in meters directly, with no degree-to-meter fudge factor
+        center = conductor.centroid
+        transformer = _get_transformer(round(center.y, 2), round(center.x, 2))
+        conductor_m = shapely_transform(transformer.transform, conductor)
+        obstacle_m = shapely_transform(transformer.transform, obstacle)
+
+        # One closest-point traversal: shortest_line yields the distance
+        # (its length) and both nearest points (its endpoints), where
+        # distance() plus nearest_points() would solve the same problem
+        # twice in GEOS
+        segment = shapely.shortest_line(conductor_m, obstacle_m)
+        (cx, cy), (ox, oy) = segment.coords[0], segment.coords[-1]
+
+        inverse = _inverse_transform(transformer)
+        nearest_on_conductor = Point(*inverse(cx, cy))
+        nearest_on_obstacle = Point(*inverse(ox, oy))
+
+        # The AEQD segment locates the closest pair; the ellipsoidal
+        # geodesic between its endpoints measures it exactly
+        _, _, min_distance_meters = _WGS84_GEOD.inv(
+            nearest_on_conductor.x, nearest_on_conductor.y,
+            nearest_on_obstacle.x, nearest_on_obstacle.y)
 
         # Check if clearance is sufficient
         clearance_ok = min_distance_meters >= required_clearance
@@ -388,6 +650,186 @@ def check_clearance(
         raise ValueError(f"Clearance check failed: {str(e)}")
 
 
+@gis_mcp.tool()
+def check_clearance_many(
+    conductor_line: str,
+    obstacle_geometries: List[str],
+    minimum_clearance: float = 7.0,
+    voltage_kv: Optional[float] = None
+) -> Dict[str, Any]:
+    """Check clearance of one conductor against many obstacles at once.
+
+    Batched counterpart of check_clearance: all obstacles are decoded
+    with shapely's array WKT reader and measured in one vectorized
+    distance/shortest_line pass, so GEOS is crossed once per batch
+    instead of once per obstacle.
+
+    Args:
+        conductor_line: WKT LineString of conductor path
+        obstacle_geometries: List of WKT obstacle geometries
+        minimum_clearance: Minimum required clearance (meters)
+        voltage_kv: Optional line voltage (kV) for regulatory clearance calc
+
+    Returns:
+        Dictionary of parallel lists, one entry per obstacle:
+        - minimum_distances_meters, clearance_ok, clearance_margins_meters
+        - nearest_points_on_conductor: [lon, lat] per obstacle
+        plus violation_count, nearest_obstacle_index (via STRtree) and
+        the shared required_clearance_meters.
+
+    Example:
+        >>> check_clearance_many("LINESTRING(0 0, 1 1)", ["POINT(0.5 0.4)"])
+        {'obstacle_count': 1, 'minimum_distances_meters': [7849.2], ...}
+    """
+    try:
+        if not obstacle_geometries:
+            raise ValueError("At least one obstacle geometry is required")
+
+        conductor = _parse_wkt(conductor_line)
+        obstacles = _parse_wkt_array(obstacle_geometries)
+
+        required_clearance = _required_clearance(minimum_clearance, voltage_kv)
+
+        # Project the conductor and the whole obstacle batch to a local
+        # AEQD in one coordinate pass each, then measure in meters
+        center = conductor.centroid
+        transformer = _get_transformer(round(center.y, 2), round(center.x, 2))
+        conductor_m = shapely_transform(transformer.transform, conductor)
+        obstacles_m = _project_geometries(obstacles, transformer)
+
+        distances = shapely.distance(conductor_m, obstacles_m)
+        segments = shapely.shortest_line(conductor_m, obstacles_m)
+
+        # Closest points on the conductor, reprojected in one batch
+        seg_coords = shapely.get_coordinates(segments).reshape(-1, 2, 2)
+        lons, lats = transformer.transform(
+            seg_coords[:, 0, 0], seg_coords[:, 0, 1], direction="INVERSE")
+        nearest_on_conductor = np.column_stack([lons, lats]).round(6)
+
+        clearance_ok = distances >= required_clearance
+        margins = distances - required_clearance
+
+        tree = shapely.STRtree(obstacles_m)
+        nearest_idx = int(tree.nearest(conductor_m))
+
+        return {
+            "obstacle_count": len(obstacle_geometries),
+            "required_clearance_meters": round(required_clearance, 2),
+            "minimum_distances_meters": distances.round(2).tolist(),
+            "clearance_ok": clearance_ok.tolist(),
+            "clearance_margins_meters": margins.round(2).tolist(),
+            "nearest_points_on_conductor": nearest_on_conductor.tolist(),
+            "violation_count": int(np.count_nonzero(~clearance_ok)),
+            "nearest_obstacle_index": nearest_idx,
+            "voltage_kv": voltage_kv,
+            "status": "PASS" if bool(clearance_ok.all()) else "FAIL"
+        }
+
+    except Exception as e:
+        logger.error(f"Error checking batched clearances: {str(e)}")
+        raise ValueError(f"Batched clearance check failed: {str(e)}")
+
+
+@gis_mcp.tool()
+def check_clearances_against_tree(
+    conductor_lines: List[str],
+    obstacle_geometries: List[str],
+    minimum_clearance: float = 7.0,
+    voltage_kv: Optional[float] = None,
+    search_radius: float = 100.0,
+    worst_k: int = 3
+) -> Dict[str, Any]:
+    """Check many conductors against many obstacles via a spatial index.
+
+    Builds one STRtree over the obstacle set and prefilters each
+    conductor's candidates with a dwithin query, so the pairwise
+    O(N*M) distance matrix is never computed; exact distances run
+    vectorized on the short candidate lists only.
+
+    Args:
+        conductor_lines: List of WKT conductor LineStrings
+        obstacle_geometries: List of WKT obstacle geometries
+        minimum_clearance: Minimum required clearance (meters)
+        voltage_kv: Optional line voltage (kV) for regulatory clearance calc
+        search_radius: Candidate prefilter radius (meters); obstacles
+            farther than this are ignored for a conductor
+        worst_k: Number of worst-clearance matches reported per conductor
+
+    Returns:
+        Dictionary with per-conductor result entries:
+        - conductor_index, candidates_within_radius, violation_count
+        - worst_matches: up to worst_k of
+          {obstacle_index, distance_meters, clearance_ok}
+
+    Example:
+        >>> check_clearances_against_tree(["LINESTRING(0 0, 1 1)"],
+        ...                               ["POINT(0.5 0.4)"], 7.0)
+        {'conductor_count': 1, 'results': [...], ...}
+    """
+    try:
+        if not conductor_lines or not obstacle_geometries:
+            raise ValueError("Both conductor and obstacle lists must be non-empty")
+
+        conductors = _parse_wkt_array(conductor_lines)
+        obstacles = _parse_wkt_array(obstacle_geometries)
+
+        required_clearance = _required_clearance(minimum_clearance, voltage_kv)
+
+        # One AEQD centered on the conductor set covers the whole scene
+        centers = shapely.get_coordinates(conductors)
+        avg_lon, avg_lat = (float(v) for v in centers.mean(axis=0))
+        transformer = _get_transformer(round(avg_lat, 2), round(avg_lon, 2))
+        conductors_m = _project_geometries(conductors, transformer)
+        obstacles_m = _project_geometries(obstacles, transformer)
+
+        tree = shapely.STRtree(obstacles_m)
+
+        results = []
+        total_violations = 0
+        for i, conductor_m in enumerate(conductors_m):
+            candidate_idx = tree.query(
+                conductor_m, predicate='dwithin', distance=search_radius)
+
+            if candidate_idx.size:
+                distances = shapely.distance(conductor_m, obstacles_m[candidate_idx])
+                order = np.argsort(distances)[:worst_k]
+                violations = int(np.count_nonzero(distances < required_clearance))
+                worst_matches = [
+                    {
+                        "obstacle_index": int(candidate_idx[j]),
+                        "distance_meters": round(float(distances[j]), 2),
+                        "clearance_ok": bool(distances[j] >= required_clearance)
+                    }
+                    for j in order
+                ]
+            else:
+                violations = 0
+                worst_matches = []
+
+            total_violations += violations
+            results.append({
+                "conductor_index": i,
+                "candidates_within_radius": int(candidate_idx.size),
+                "violation_count": violations,
+                "worst_matches": worst_matches
+            })
+
+        return {
+            "conductor_count": len(conductor_lines),
+            "obstacle_count": len(obstacle_geometries),
+            "required_clearance_meters": round(required_clearance, 2),
+            "search_radius_meters": search_radius,
+            "total_violation_count": total_violations,
+            "results": results,
+            "voltage_kv": voltage_kv,
+            "status": "PASS" if total_violations == 0 else "FAIL"
+        }
+
+    except Exception as e:
+        logger.error(f"Error checking clearances against tree: {str(e)}")
+        raise ValueError(f"Indexed clearance check failed: {str(e)}")
+
+
 @gis_mcp.tool()
 def create_row_buffer(
     centerline: str,
@@ -419,39 +861,41 @@ def create_row_buffer(
     """
     try:
         # Parse centerline
-        line = wkt.loads(centerline)
+        line = _parse_wkt(centerline)
 
         if not isinstance(line, LineString):
             raise ValueError("Centerline must be a LineString geometry")
 
-        # Map cap_style string to Shapely parameter
-        cap_style_map = {
-            "flat": 2,
-            "round": 1,
-            "square": 3
-        }
-        cap_style_param = cap_style_map.get(cap_style.lower(), 2)
-
-        # Calculate half-width in degrees (rough approximation)
-        coords = list(line.coords)
-        avg_lat = sum(c[1] for c in coords) / len(coords)
-        meters_per_degree = 111320 * math.cos(math.radians(avg_lat))
-        half_width_degrees = (row_width / 2) / meters_per_degree
-
-        # Create buffer
-        row_polygon = line.buffer(
-            half_width_degrees,
+        # shapely.buffer takes cap styles by name
+        cap_style_param = cap_style.lower()
+        if cap_style_param not in ("flat", "round", "square"):
+            cap_style_param = "flat"
+
+        # Buffer in a local AEQD so the corridor is metrically correct
+        # at any latitude (a degree-space buffer distorts away from the
+        # equator) and area/length come out in meters directly
+        coords_xy = shapely.get_coordinates(line)
+        avg_lon, avg_lat = (float(v) for v in coords_xy.mean(axis=0))
+        transformer = _get_transformer(round(avg_lat, 2), round(avg_lon, 2))
+        line_m = shapely_transform(transformer.transform, line)
+
+        # Array-API buffer so batched centerlines can reuse this path
+        row_polygon_m = shapely.buffer(
+            line_m,
+            row_width / 2,
             cap_style=cap_style_param,
-            join_style=1  # Round joins
+            join_style="round"
         )
 
-        # Calculate area (convert from square degrees to square meters)
-        area_sq_degrees = row_polygon.area
-        area_sq_meters = area_sq_degrees * (meters_per_degree ** 2)
+        length_meters = line_m.length
 
-        # Calculate centerline length
-        length_degrees = line.length
-        length_meters = length_degrees * meters_per_degree
+        # Reproject the corridor back to lon/lat for the WKT output
+        row_polygon = shapely_transform(_inverse_transform(transformer), row_polygon_m)
+
+        # True geodesic area on the ellipsoid; the sign encodes ring
+        # orientation, so take the magnitude
+        geod_area, _ = _WGS84_GEOD.geometry_area_perimeter(row_polygon)
+        area_sq_meters = abs(geod_area)
 
         result = {
             "row_polygon_wkt": row_polygon.wkt,
@@ -464,22 +908,27 @@ def create_row_buffer(
 
         # Add station markers if requested
         if include_stations:
-            # Create markers every 100 meters
-            station_interval_deg = 100 / meters_per_degree
-            num_stations = int(line.length / station_interval_deg)
-            stations = []
-
-            for i in range(num_stations + 1):
-                fraction = (i * station_interval_deg) / line.length
-                if fraction <= 1.0:
-                    point = line.interpolate(fraction, normalized=True)
-                    stations.append({
-                        "station_number": i,
-                        "position": [round(point.x, 6), round(point.y, 6)],
-                        "distance_meters": i * 100
-                    })
-
-            result["stations"] = stations
+            # Create markers every 100 meters. All stations come from one
+            # np.interp per axis over cumulative meter arc length instead
+            # of a GEOS interpolate() call (and a length division) each.
+            mcoords = shapely.get_coordinates(line_m)
+            seg_m = np.hypot(np.diff(mcoords[:, 0]), np.diff(mcoords[:, 1]))
+            cum_m = np.concatenate(([0.0], np.cumsum(seg_m)))
+
+            targets = np.arange(int(length_meters / 100) + 1) * 100.0
+            targets = targets[targets <= cum_m[-1]]
+            lons = np.interp(targets, cum_m, coords_xy[:, 0])
+            lats = np.interp(targets, cum_m, coords_xy[:, 1])
+            positions = np.column_stack([lons, lats]).round(6).tolist()
+
+            result["stations"] = [
+                {
+                    "station_number": i,
+                    "position": position,
+                    "distance_meters": i * 100
+                }
+                for i, position in enumerate(positions)
+            ]
 
         return result
 
@@ -492,7 +941,8 @@ def create_row_buffer(
 def calculate_catenary_curve(
     span_length: float,
     sag: float,
-    num_points: int = 50
+    num_points: int = 50,
+    return_arrays: bool = False
 ) -> Dict[str, Any]:
     """Generate catenary curve points for conductor visualization.
 
@@ -504,6 +954,9 @@ def calculate_catenary_curve(
         span_length: Horizontal span distance (meters)
         sag: Maximum sag at midspan (meters)
         num_points: Number of points to generate along curve
+        return_arrays: When True, curve_points is returned as
+            column-oriented {'x': [...], 'y': [...]} float32 lists
+            instead of [x, y] pairs (compact for large num_points)
 
     Returns:
         Dictionary containing:
@@ -519,36 +972,60 @@ def calculate_catenary_curve(
     try:
         # Calculate catenary constant from span and sag
         # For a catenary: sag = c * (cosh(L/2c) - 1)
-        # We need to solve for c given sag and L
-
-        # Simplified approximation: c ≈ L^2 / (8 * sag)
-        catenary_constant = (span_length ** 2) / (8 * sag)
-
-        # Generate points along the curve
-        curve_points = []
-        x_values = np.linspace(0, span_length, num_points)
+        # The parabolic closed form c ~ L^2 / (8*sag) is only good for
+        # small sag/span ratios, so use it as the seed for a Newton
+        # solve of f(c) = c*(cosh(L/2c) - 1) - sag; a handful of
+        # cosh/sinh evaluations buys the true constant for deep sags.
+        seed = (span_length ** 2) / (8 * sag)
+        catenary_constant = seed
+        half_span = span_length / 2.0
+        for _ in range(10):
+            u = half_span / catenary_constant
+            cosh_u = math.cosh(u)
+            residual = catenary_constant * (cosh_u - 1.0) - sag
+            derivative = cosh_u - 1.0 - u * math.sinh(u)
+            if derivative == 0:
+                break
+            step = residual / derivative
+            catenary_constant -= step
+            if not math.isfinite(catenary_constant) or catenary_constant <= 0:
+                catenary_constant = seed
+                break
+            if abs(step) < 1e-10:
+                break
+
+        if _catenary_kernel is not None:
+            # Compiled kernel fuses point generation and arc length
+            x_values, y_values, curve_length = _catenary_kernel(
+                float(span_length), float(sag),
+                float(catenary_constant), int(num_points))
+            curve_length = float(curve_length)
+        else:
+            # Vectorized NumPy fallback
+            x_values = np.linspace(0, span_length, num_points)
 
-        for x in x_values:
             # Catenary equation: y = c * (cosh((x - L/2) / c) - 1)
             # Shifted so midpoint is at lowest point
-            x_shifted = x - (span_length / 2)
+            x_shifted = x_values - (span_length / 2)
             if catenary_constant > 0:
-                y = catenary_constant * (math.cosh(x_shifted / catenary_constant) - 1)
+                y_values = catenary_constant * (np.cosh(x_shifted / catenary_constant) - 1)
             else:
                 # Fallback to parabola if catenary constant invalid
-                y = (4 * sag / (span_length ** 2)) * x * (span_length - x)
+                y_values = (4 * sag / (span_length ** 2)) * x_values * (span_length - x_values)
 
             # Adjust so supports are at y=0 and sag is negative
-            y = y - sag
+            y_values = y_values - sag
 
-            curve_points.append([round(float(x), 2), round(float(y), 2)])
+            # Actual curve length: two C-level diffs and one reduction
+            curve_length = float(np.hypot(np.diff(x_values), np.diff(y_values)).sum())
 
-        # Calculate actual curve length using trapezoidal integration
-        curve_length = 0
-        for i in range(len(curve_points) - 1):
-            dx = curve_points[i+1][0] - curve_points[i][0]
-            dy = curve_points[i+1][1] - curve_points[i][1]
-            curve_length += math.sqrt(dx**2 + dy**2)
+        if return_arrays:
+            curve_points = {
+                "x": np.round(x_values, 2).astype(np.float32).tolist(),
+                "y": np.round(y_values, 2).astype(np.float32).tolist()
+            }
+        else:
+            curve_points = np.stack([x_values, y_values], axis=1).round(2).tolist()
 
         return {
             "curve_points": curve_points,
@@ -571,7 +1048,8 @@ def analyze_line_of_sight(
     point2: List[float],
     terrain_profile: List[float],
     observer_height: float = 2.0,
-    target_height: float = 30.0
+    target_height: float = 30.0,
+    details: bool = True
 ) -> Dict[str, Any]:
     """Analyze line-of-sight visibility between two towers.
 
@@ -584,13 +1062,16 @@ def analyze_line_of_sight(
         terrain_profile: List of terrain elevations between points
         observer_height: Height above ground at point1 (meters)
         target_height: Height above ground at point2 (meters)
+        details: When False, skip the clearance metrics and return only
+            the clear/obstructed verdict (cheapest possible check)
 
     Returns:
         Dictionary containing:
         - line_of_sight_clear: Boolean if sight line is clear
         - max_obstruction_height: Maximum terrain above sight line (meters)
         - clearance_margin: Minimum clearance above terrain (meters)
-        - obstruction_points: List of obstructed sample indices
+        - obstruction_points: Sample indices of the worst obstructions
+          (capped at 20; obstruction_count has the full total)
 
     Example:
         >>> analyze_line_of_sight([0,0,100], [1,0,120], [100,105,110,108,120])
@@ -601,28 +1082,66 @@ def analyze_line_of_sight(
         elev1 = point1[2] + observer_height
         elev2 = point2[2] + target_height
 
-        # Create sight line elevations
-        num_samples = len(terrain_profile)
-        sight_line_elevations = np.linspace(elev1, elev2, num_samples)
-
-        # Compare sight line with terrain
-        terrain_array = np.array(terrain_profile)
-        clearances = sight_line_elevations - terrain_array
+        # Compare sight line with terrain; float32 halves the memory
+        # traffic on long profiles and is ample for meter-level clearances
+        terrain_array = np.asarray(terrain_profile, dtype=np.float32)
+        num_samples = terrain_array.size
+
+        if not details:
+            # Verdict-only fast path: a single fused test (with early
+            # exit under numba) and none of the clearance metrics
+            if _los_any_obstruction is not None:
+                obstructed = bool(_los_any_obstruction(
+                    float(elev1), float(elev2), terrain_array))
+            else:
+                sight_line_elevations = np.linspace(
+                    elev1, elev2, num_samples, dtype=np.float32)
+                obstructed = bool(np.any(sight_line_elevations < terrain_array))
+            return {
+                "line_of_sight_clear": not obstructed,
+                "profile_samples": num_samples,
+                "status": "OBSTRUCTED" if obstructed else "CLEAR"
+            }
 
-        # Find obstructions
-        obstructions = clearances < 0
-        obstruction_indices = np.where(obstructions)[0].tolist()
+        clearances = None
 
-        # Calculate metrics
-        line_of_sight_clear = not np.any(obstructions)
-        min_clearance = float(np.min(clearances))
-        max_obstruction = float(np.min(clearances)) if not line_of_sight_clear else 0.0
+        if _los_kernel is not None:
+            # Compiled single-pass kernel: no linspace/clearance
+            # temporaries in the common all-clear case
+            min_clearance, obstruction_count = _los_kernel(
+                float(elev1), float(elev2), terrain_array)
+            min_clearance = float(min_clearance)
+            obstruction_count = int(obstruction_count)
+        else:
+            sight_line_elevations = np.linspace(
+                elev1, elev2, num_samples, dtype=np.float32)
+            clearances = sight_line_elevations - terrain_array
+
+            # One reduction each instead of repeated passes over the profile
+            min_clearance = float(clearances.min())
+            obstruction_count = int(np.count_nonzero(clearances < 0))
+
+        line_of_sight_clear = min_clearance >= 0
+        max_obstruction = min_clearance if not line_of_sight_clear else 0.0
+
+        # Report only the worst offenders; the full index list can be
+        # huge on long, mostly obstructed profiles
+        if obstruction_count:
+            if clearances is None:
+                sight_line_elevations = np.linspace(
+                    elev1, elev2, num_samples, dtype=np.float32)
+                clearances = sight_line_elevations - terrain_array
+            k = min(obstruction_count, _MAX_OBSTRUCTION_INDICES)
+            worst = np.argpartition(clearances, k - 1)[:k]
+            obstruction_indices = np.sort(worst).tolist()
+        else:
+            obstruction_indices = []
 
         return {
             "line_of_sight_clear": line_of_sight_clear,
             "clearance_margin_meters": round(min_clearance, 2),
             "max_obstruction_height_meters": round(abs(max_obstruction), 2),
-            "obstruction_count": len(obstruction_indices),
+            "obstruction_count": obstruction_count,
             "obstruction_sample_indices": obstruction_indices,
             "observer_height_asl_meters": round(elev1, 2),
             "target_height_asl_meters": round(elev2, 2),
@@ -11,7 +11,9 @@ def test_tools_registered():
 
     # Get all registered tools using get_tools() method
     all_tools = gis_mcp.get_tools()
-    tool_names = [tool.name for tool in all_tools]
+    # Set, not list: every membership check below is O(1) instead of a
+    # scan over the full registry
+    tool_names = {tool.name for tool in all_tools}
 
     print("=" * 60)
     print("REGISTERED MCP TOOLS TEST")
@@ -2,9 +2,34 @@
 """Simplified test script for new transmission line and KML integration tools."""
 
 import sys
+from concurrent.futures import ThreadPoolExecutor
+
 sys.path.insert(0, 'src')
 
 
+def _run_cases(cases):
+    """Run (name, call, report) cases concurrently, printing in order.
+
+    The tool calls are independent and spend their time in C-backed
+    libraries (shapely, pyproj, numpy, lxml) that release the GIL, so a
+    thread pool overlaps them; results are reported sequentially so the
+    output stays deterministic.
+    """
+    passed = 0
+    failed = 0
+    with ThreadPoolExecutor() as executor:
+        futures = [executor.submit(call) for _, call, _ in cases]
+        for i, ((name, _, report), future) in enumerate(zip(cases, futures), 1):
+            print(f"\n{i}. Testing {name}...")
+            try:
+                report(future.result())
+                passed += 1
+            except Exception as e:
+                print(f"   ✗ Error: {e}")
+                failed += 1
+    return passed, failed
+
+
 def test_transmission_line_tools():
     """Test transmission line tool functionality."""
     from gis_mcp import transmission_line_functions
@@ -13,123 +38,95 @@ def test_transmission_line_tools():
     print("TRANSMISSION LINE TOOLS FUNCTIONAL TEST")
     print("=" * 60)
 
-    passed = 0
-    failed = 0
-
-    # Test 1: Calculate conductor sag
-    print("\n1. Testing calculate_conductor_sag...")
-    try:
-        result = transmission_line_functions.calculate_conductor_sag.fn(
-            span_length=300.0,
-            conductor_weight=1.5,
-            tension=20000.0,
-            temperature=25.0
-        )
+    def report_sag(result):
         print(f"   ✓ Sag calculation successful: {result['sag_meters']} meters")
         print(f"   ✓ Catenary constant: {result['catenary_constant']} meters")
-        passed += 1
-    except Exception as e:
-        print(f"   ✗ Error: {e}")
-        failed += 1
-
-    # Test 2: Calculate span length
-    print("\n2. Testing calculate_span_length...")
-    try:
-        result = transmission_line_functions.calculate_span_length.fn(
-            point1=[0.0, 0.0, 100.0],
-            point2=[0.005, 0.0, 150.0],
-            include_elevation=True
-        )
+
+    def report_span(result):
         print(f"   ✓ Span calculation successful")
         print(f"   ✓ Horizontal distance: {result['horizontal_distance_meters']} meters")
         print(f"   ✓ Slant distance: {result.get('slant_distance_meters', 'N/A')} meters")
-        passed += 1
-    except Exception as e:
-        print(f"   ✗ Error: {e}")
-        failed += 1
-
-    # Test 3: Analyze tower placement
-    print("\n3. Testing analyze_tower_placement...")
-    try:
-        result = transmission_line_functions.analyze_tower_placement.fn(
-            route_line="LINESTRING(0 0, 0.01 0, 0.02 0)",
-            typical_span=300.0
-        )
+
+    def report_towers(result):
         print(f"   ✓ Tower placement analysis successful")
         print(f"   ✓ Recommended towers: {result['tower_count']}")
         print(f"   ✓ Total route length: {result['total_route_length_meters']} meters")
-        passed += 1
-    except Exception as e:
-        print(f"   ✗ Error: {e}")
-        failed += 1
-
-    # Test 4: Create ROW buffer
-    print("\n4. Testing create_row_buffer...")
-    try:
-        result = transmission_line_functions.create_row_buffer.fn(
-            centerline="LINESTRING(0 0, 0.01 0)",
-            row_width=30.0
-        )
+
+    def report_row(result):
         print(f"   ✓ ROW buffer created successfully")
         print(f"   ✓ ROW area: {result['row_area_sq_meters']:.2f} sq meters")
         print(f"   ✓ ROW area: {result['row_area_acres']:.2f} acres")
-        passed += 1
-    except Exception as e:
-        print(f"   ✗ Error: {e}")
-        failed += 1
-
-    # Test 5: Calculate catenary curve
-    print("\n5. Testing calculate_catenary_curve...")
-    try:
-        result = transmission_line_functions.calculate_catenary_curve.fn(
-            span_length=300.0,
-            sag=8.5,
-            num_points=50
-        )
+
+    def report_catenary(result):
         print(f"   ✓ Catenary curve generated successfully")
         print(f"   ✓ Number of points: {len(result['curve_points'])}")
         print(f"   ✓ Curve length: {result['curve_length_meters']} meters")
-        passed += 1
-    except Exception as e:
-        print(f"   ✗ Error: {e}")
-        failed += 1
-
-    # Test 6: Check clearance
-    print("\n6. Testing check_clearance...")
-    try:
-        result = transmission_line_functions.check_clearance.fn(
-            conductor_line="LINESTRING(0 0, 1 1)",
-            obstacle_geometry="POINT(0.5 0.4)",
-            minimum_clearance=7.0,
-            voltage_kv=230.0
-        )
+
+    def report_clearance(result):
         print(f"   ✓ Clearance check successful")
         print(f"   ✓ Clearance status: {result['status']}")
         print(f"   ✓ Minimum distance: {result['minimum_distance_meters']} meters")
-        passed += 1
-    except Exception as e:
-        print(f"   ✗ Error: {e}")
-        failed += 1
-
-    # Test 7: Analyze line of sight
-    print("\n7. Testing analyze_line_of_sight...")
-    try:
-        result = transmission_line_functions.analyze_line_of_sight.fn(
-            point1=[0, 0, 100],
-            point2=[1, 0, 120],
-            terrain_profile=[100, 105, 110, 108, 120],
-            observer_height=2.0,
-            target_height=30.0
-        )
+
+    def report_los(result):
         print(f"   ✓ Line of sight analysis successful")
         print(f"   ✓ Line of sight clear: {result['line_of_sight_clear']}")
         print(f"   ✓ Clearance margin: {result['clearance_margin_meters']} meters")
-        passed += 1
-    except Exception as e:
-        print(f"   ✗ Error: {e}")
-        failed += 1
 
-    return passed, failed
+    cases = [
+        ("calculate_conductor_sag",
+         lambda: transmission_line_functions.calculate_conductor_sag.fn(
+             span_length=300.0,
+             conductor_weight=1.5,
+             tension=20000.0,
+             temperature=25.0
+         ),
+         report_sag),
+        ("calculate_span_length",
+         lambda: transmission_line_functions.calculate_span_length.fn(
+             point1=[0.0, 0.0, 100.0],
+             point2=[0.005, 0.0, 150.0],
+             include_elevation=True
+         ),
+         report_span),
+        ("analyze_tower_placement",
+         lambda: transmission_line_functions.analyze_tower_placement.fn(
+             route_line="LINESTRING(0 0, 0.01 0, 0.02 0)",
+             typical_span=300.0
+         ),
+         report_towers),
+        ("create_row_buffer",
+         lambda: transmission_line_functions.create_row_buffer.fn(
+             centerline="LINESTRING(0 0, 0.01 0)",
+             row_width=30.0
+         ),
+         report_row),
+        ("calculate_catenary_curve",
+         lambda: transmission_line_functions.calculate_catenary_curve.fn(
+             span_length=300.0,
+             sag=8.5,
+             num_points=50
+         ),
+         report_catenary),
+        ("check_clearance",
+         lambda: transmission_line_functions.check_clearance.fn(
+             conductor_line="LINESTRING(0 0, 1 1)",
+             obstacle_geometry="POINT(0.5 0.4)",
+             minimum_clearance=7.0,
+             voltage_kv=230.0
+         ),
+         report_clearance),
+        ("analyze_line_of_sight",
+         lambda: transmission_line_functions.analyze_line_of_sight.fn(
+             point1=[0, 0, 100],
+             point2=[1, 0, 120],
+             terrain_profile=[100, 105, 110, 108, 120],
+             observer_height=2.0,
+             target_height=30.0
+         ),
+         report_los),
+    ]
+
+    return _run_cases(cases)
 
 
 def test_kml_integration_tools():
@@ -140,9 +137,6 @@ def test_kml_integration_tools():
     print("KML INTEGRATION TOOLS FUNCTIONAL TEST")
     print("=" * 60)
 
-    passed = 0
-    failed = 0
-
     # Create sample KML content
     sample_kml = """<?xml version="1.0" encoding="UTF-8"?>
 <kml xmlns="http://www.opengis.net/kml/2.2">
@@ -175,84 +169,67 @@ def test_kml_integration_tools():
   </Document>
 </kml>"""
 
-    # Test 1: Parse KML
-    print("\n1. Testing parse_kml_file...")
-    try:
-        result = kml_integration_functions.parse_kml_file.fn(
-            kml_content=sample_kml,
-            extract_styles=True,
-            include_metadata=True
-        )
+    def report_parse(result):
         print(f"   ✓ KML parsing successful")
         print(f"   ✓ Features found: {result['feature_count']}")
         print(f"   ✓ Geometry types: {result['geometry_types']}")
-        passed += 1
-    except Exception as e:
-        print(f"   ✗ Error: {e}")
-        failed += 1
-
-    # Test 2: Validate transmission line KML
-    print("\n2. Testing validate_transmission_line_kml...")
-    try:
-        result = kml_integration_functions.validate_transmission_line_kml.fn(
-            kml_content=sample_kml,
-            require_line_routes=True,
-            require_tower_points=True
-        )
+
+    def report_validate(result):
         print(f"   ✓ Validation complete")
         print(f"   ✓ Valid: {result['valid']}")
         print(f"   ✓ Errors: {len(result['validation_errors'])}")
         print(f"   ✓ Warnings: {len(result['validation_warnings'])}")
-        passed += 1
-    except Exception as e:
-        print(f"   ✗ Error: {e}")
-        failed += 1
-
-    # Test 3: Extract tower locations
-    print("\n3. Testing extract_tower_locations...")
-    try:
-        result = kml_integration_functions.extract_tower_locations.fn(
-            kml_content=sample_kml
-        )
+
+    def report_towers(result):
         print(f"   ✓ Tower extraction successful")
         print(f"   ✓ Towers found: {result['tower_count']}")
         if result['tower_count'] > 0:
             print(f"   ✓ First tower: {result['towers'][0]['name']}")
-        passed += 1
-    except Exception as e:
-        print(f"   ✗ Error: {e}")
-        failed += 1
-
-    # Test 4: Extract line routes
-    print("\n4. Testing extract_line_routes...")
-    try:
-        result = kml_integration_functions.extract_line_routes.fn(
-            kml_content=sample_kml
-        )
+
+    def report_routes(result):
         print(f"   ✓ Route extraction successful")
         print(f"   ✓ Routes found: {result['route_count']}")
         if result['route_count'] > 0:
             print(f"   ✓ First route: {result['routes'][0]['name']}")
-        passed += 1
-    except Exception as e:
-        print(f"   ✗ Error: {e}")
-        failed += 1
-
-    # Test 5: Convert to GeoJSON
-    print("\n5. Testing convert_kml_to_geojson...")
-    try:
-        result = kml_integration_functions.convert_kml_to_geojson.fn(
-            kml_content=sample_kml
-        )
+
+    def report_geojson(result):
         print(f"   ✓ GeoJSON conversion successful")
         print(f"   ✓ Features converted: {result['feature_count']}")
         print(f"   ✓ GeoJSON type: {result['geojson']['type']}")
-        passed += 1
-    except Exception as e:
-        print(f"   ✗ Error: {e}")
-        failed += 1
 
-    return passed, failed
+    cases = [
+        ("parse_kml_file",
+         lambda: kml_integration_functions.parse_kml_file.fn(
+             kml_content=sample_kml,
+             extract_styles=True,
+             include_metadata=True
+         ),
+         report_parse),
+        ("validate_transmission_line_kml",
+         lambda: kml_integration_functions.validate_transmission_line_kml.fn(
+             kml_content=sample_kml,
+             require_line_routes=True,
+             require_tower_points=True
+         ),
+         report_validate),
+        ("extract_tower_locations",
+         lambda: kml_integration_functions.extract_tower_locations.fn(
+             kml_content=sample_kml
+         ),
+         report_towers),
+        ("extract_line_routes",
+         lambda: kml_integration_functions.extract_line_routes.fn(
+             kml_content=sample_kml
+         ),
+         report_routes),
+        ("convert_kml_to_geojson",
+         lambda: kml_integration_functions.convert_kml_to_geojson.fn(
+             kml_content=sample_kml
+         ),
+         report_geojson),
+    ]
+
+    return _run_cases(cases)
 
 
 if __name__ == '__main__':
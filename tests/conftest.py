@@ -1,7 +1,6 @@
 """Pytest configuration and shared fixtures."""
 import pytest
 import sys
-import tempfile
 import os
 import json
 from pathlib import Path
@@ -25,11 +24,33 @@ async def mcp_client():
         yield client
 
 
+@pytest.fixture(scope="session")
+def mock_gadm_geodataframe():
+    """GADM mock GeoDataFrame, built once per session on first use."""
+    from tests.fixtures.mock_data import MOCK_GADM_GEODATAFRAME
+    return MOCK_GADM_GEODATAFRAME
+
+
+@pytest.fixture(scope="session")
+def _session_tmp(tmp_path_factory):
+    """One session-wide temp root; per-test dirs nest under it."""
+    return tmp_path_factory.mktemp("gis_mcp_tests")
+
+
 @pytest.fixture
-def temp_dir():
-    """Create a temporary directory for test outputs."""
-    with tempfile.TemporaryDirectory() as tmpdir:
-        yield tmpdir
+def temp_dir(_session_tmp, request):
+    """Create a temporary directory for test outputs.
+
+    A subdirectory of the session root keyed by the test's node id, so
+    each test stays isolated while the suite pays the tempdir
+    create/teardown cost once instead of per test.
+    """
+    safe_name = "".join(
+        c if c.isalnum() or c in "._-" else "_" for c in request.node.nodeid
+    )
+    d = _session_tmp / safe_name
+    d.mkdir(parents=True, exist_ok=True)
+    return str(d)
 
 
 @pytest.fixture
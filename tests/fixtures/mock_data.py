@@ -2,24 +2,50 @@
 import json
 from pathlib import Path
 import geopandas as gpd
+import shapely
 from shapely.geometry import Point, Polygon
 import numpy as np
 
-# GADM Mock Data
-MOCK_GADM_GEODATAFRAME = gpd.GeoDataFrame(
-    {
-        'GID_0': ['USA', 'USA'],
-        'NAME_0': ['United States', 'United States'],
-        'GID_1': ['USA.1_1', 'USA.2_1'],
-        'NAME_1': ['California', 'Texas'],
-        'TYPE_1': ['State', 'State'],
-    },
-    geometry=[
-        Polygon([(-124, 32), (-114, 32), (-114, 42), (-124, 42), (-124, 32)]),
-        Polygon([(-106, 26), (-94, 26), (-94, 36), (-106, 36), (-106, 26)]),
-    ],
-    crs='EPSG:4326'
-)
+# Mirror the optional-lxml pattern from gis_mcp.kml_integration_functions
+# so the pre-parsed KML fixture works in both environments.
+try:
+    from lxml import etree as _etree
+except ImportError:
+    import xml.etree.ElementTree as _etree
+
+# GADM Mock Data. Rings are stacked into one array and built through the
+# vectorized shapely.polygons constructor, which stays C-speed as the
+# fixture set grows. Construction is deferred (see module __getattr__
+# below) so importing mock_data stays cheap for tests that never touch
+# the GeoDataFrame; prefer the session-scoped mock_gadm_geodataframe
+# fixture from conftest in new tests.
+def _build_mock_gdf():
+    """Construct the GADM mock GeoDataFrame."""
+    rings = np.array([
+        [[-124, 32], [-114, 32], [-114, 42], [-124, 42], [-124, 32]],
+        [[-106, 26], [-94, 26], [-94, 36], [-106, 36], [-106, 26]],
+    ], dtype=np.float64)
+    return gpd.GeoDataFrame(
+        {
+            'GID_0': ['USA', 'USA'],
+            'NAME_0': ['United States', 'United States'],
+            'GID_1': ['USA.1_1', 'USA.2_1'],
+            'NAME_1': ['California', 'Texas'],
+            'TYPE_1': ['State', 'State'],
+        },
+        geometry=shapely.polygons(rings),
+        crs='EPSG:4326'
+    )
+
+
+def __getattr__(name):
+    # PEP 562 lazy attribute: build (and cache) on first access so
+    # `from ... import MOCK_GADM_GEODATAFRAME` keeps working unchanged
+    if name == 'MOCK_GADM_GEODATAFRAME':
+        value = _build_mock_gdf()
+        globals()[name] = value
+        return value
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 # GBIF Mock Data
 MOCK_GBIF_SPECIES_INFO = {
@@ -228,6 +254,80 @@ MOCK_WORLDCOVER_ITEM = {
     "collection": "esa-worldcover"
 }
 
+# KML Mock Data. The string is the canonical fixture; the pre-parsed
+# tree and GeoJSON equivalents are built once at import so tests never
+# re-parse per function. Tests that need to mutate the tree should take
+# copy.deepcopy(MOCK_KML_TREE) (a C-level copy under lxml) instead of
+# re-parsing the string.
+MOCK_KML_STRING = """<?xml version="1.0" encoding="UTF-8"?>
+<kml xmlns="http://www.opengis.net/kml/2.2">
+  <Document>
+    <name>Test Transmission Line</name>
+    <Placemark>
+      <name>Tower 1</name>
+      <description>First tower</description>
+      <Point>
+        <coordinates>-122.0822035425683,37.42228990140251,0</coordinates>
+      </Point>
+    </Placemark>
+    <Placemark>
+      <name>Tower 2</name>
+      <description>Second tower</description>
+      <Point>
+        <coordinates>-122.0844277547948,37.42215983204111,0</coordinates>
+      </Point>
+    </Placemark>
+    <Placemark>
+      <name>Line Route</name>
+      <description>Transmission line centerline</description>
+      <LineString>
+        <coordinates>
+          -122.0822035425683,37.42228990140251,0
+          -122.0844277547948,37.42215983204111,0
+        </coordinates>
+      </LineString>
+    </Placemark>
+  </Document>
+</kml>"""
+
+MOCK_KML_TREE = _etree.fromstring(MOCK_KML_STRING.encode())
+
+MOCK_KML_GEOJSON = {
+    "type": "FeatureCollection",
+    "features": [
+        {
+            "type": "Feature",
+            "geometry": {
+                "type": "Point",
+                "coordinates": [-122.0822035425683, 37.42228990140251, 0.0]
+            },
+            "properties": {"name": "Tower 1", "description": "First tower"}
+        },
+        {
+            "type": "Feature",
+            "geometry": {
+                "type": "Point",
+                "coordinates": [-122.0844277547948, 37.42215983204111, 0.0]
+            },
+            "properties": {"name": "Tower 2", "description": "Second tower"}
+        },
+        {
+            "type": "Feature",
+            "geometry": {
+                "type": "LineString",
+                "coordinates": [
+                    [-122.0822035425683, 37.42228990140251, 0.0],
+                    [-122.0844277547948, 37.42215983204111, 0.0]
+                ]
+            },
+            "properties": {
+                "name": "Line Route",
+                "description": "Transmission line centerline"
+            }
+        }
+    ]
+}
+
 # OSMnx Mock Graph Data
 def create_mock_osmnx_graph():
     """Create a mock NetworkX graph similar to OSMnx output."""
@@ -253,11 +353,29 @@ def create_mock_osmnx_graph():
     
     return G
 
+# Seeded new-generation RNG: faster than the legacy np.random.* global
+# state and makes the mock rasters reproducible across test runs.
+_RNG = np.random.default_rng(seed=0)
+
 # Mock raster data for satellite imagery
 def create_mock_raster_data(shape=(100, 100), dtype=np.uint16):
     """Create mock raster data similar to satellite imagery."""
-    return np.random.randint(0, 10000, size=shape, dtype=dtype)
+    return _RNG.integers(0, 10000, size=shape, dtype=dtype)
+
+def create_mock_ndvi_data(shape=(100, 100), quantize=False):
+    """Create mock NDVI data (float32, -1 to 1).
 
-def create_mock_ndvi_data(shape=(100, 100)):
-    """Create mock NDVI data (float32, -1 to 1)."""
-    return np.random.uniform(-0.5, 0.9, size=shape).astype(np.float32)
+    With quantize=True, returns (data, metadata) where data is int8
+    encoded as round(ndvi * 127) and metadata holds the decoding
+    parameters {'scale': 1/127, 'offset': 0.0}; decode lazily via
+    data.astype(np.float32) * scale + offset. The int8 form is a
+    quarter the size of float32, which matters when fixtures are
+    written to disk (np.savez_compressed) or streamed in bulk.
+    """
+    # Generator.random fills float32 natively; scale [0, 1) to
+    # [-0.5, 0.9) without the float64 intermediate + astype copy that
+    # legacy uniform() required
+    ndvi = _RNG.random(shape, dtype=np.float32) * np.float32(1.4) - np.float32(0.5)
+    if quantize:
+        return np.round(ndvi * 127).astype(np.int8), {'scale': 1 / 127, 'offset': 0.0}
+    return ndvi
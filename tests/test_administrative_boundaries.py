@@ -1,133 +1,316 @@
 """Tests for administrative boundaries data module."""
 import pytest
-from unittest.mock import Mock, patch, MagicMock
+from unittest.mock import Mock
 from pathlib import Path
-import geopandas as gpd
 
-from gis_mcp.data.administrative_boundaries import download_boundaries
-from tests.fixtures.mock_data import MOCK_GADM_GEODATAFRAME
+from gis_mcp.data.administrative_boundaries import (
+    download_boundaries,
+    download_boundaries_many,
+    _fetch_admitems,
+    _resolve_region,
+)
+
+# Every test here owns its temp_dir and its pygadm mock, so the file is
+# freely parallelizable under pytest-xdist (pytest -n auto)
+pytestmark = [pytest.mark.admin_bounds]
+
+
+def _write_stub(p, **kwargs):
+    """Stand-in serializer: create a small non-empty file like a real write."""
+    Path(p).write_text("{}")
+
+
+@pytest.fixture(autouse=True)
+def _clear_boundary_caches():
+    """Reset the module's lru_caches so mocked results never leak between tests."""
+    _fetch_admitems.cache_clear()
+    _resolve_region.cache_clear()
+    yield
+    _fetch_admitems.cache_clear()
+    _resolve_region.cache_clear()
+
+
+@pytest.fixture
+def mock_pygadm(monkeypatch):
+    """Patch pygadm once per test; returns (module mock, AdmItems result mock).
+
+    Spec'd Mocks rather than MagicMocks: the code under test only calls
+    AdmItems(...) and the two serializers, so the narrow spec skips the
+    magic-method machinery and fails fast if the pygadm surface drifts.
+    """
+    mock_adm_items = Mock(spec=["to_parquet", "to_file"])
+    mock_adm_items.to_parquet = Mock(side_effect=_write_stub)
+    mock_adm_items.to_file = Mock(side_effect=_write_stub)
+    mock_module = Mock(spec=["AdmItems"])
+    mock_module.AdmItems = Mock(return_value=mock_adm_items)
+    monkeypatch.setattr(
+        'gis_mcp.data.administrative_boundaries.pygadm', mock_module
+    )
+    return mock_module, mock_adm_items
 
 
 class TestDownloadBoundaries:
     """Test suite for download_boundaries function."""
-    
-    @patch('gis_mcp.data.administrative_boundaries.pygadm')
+
     def test_download_boundaries_success(self, mock_pygadm, temp_dir):
         """Test successful boundary download."""
-        # Setup mock
-        mock_adm_items = MagicMock()
-        mock_adm_items.to_file = MagicMock()
-        mock_pygadm.AdmItems.return_value = mock_adm_items
-        
-        # Execute
-        result = download_boundaries(
+        mock_module, mock_adm_items = mock_pygadm
+
+        result = download_boundaries.fn(
             region="USA",
             level=1,
             path=temp_dir
         )
-        
-        # Verify
+
         assert result["status"] == "success"
         assert "file_path" in result
-        assert "United_States_adm1.geojson" in result["file_path"]
-        
+        assert "United_States_adm1" in result["file_path"]
+        assert result["file_path"].endswith(".parquet")
+
         # Verify pygadm was called correctly
-        mock_pygadm.AdmItems.assert_called_once_with(
+        mock_module.AdmItems.assert_called_once_with(
             name="United States",
             content_level=1
         )
-        mock_adm_items.to_file.assert_called_once()
-    
-    @patch('gis_mcp.data.administrative_boundaries.pygadm')
+        mock_adm_items.to_parquet.assert_called_once()
+
     def test_download_boundaries_with_alias(self, mock_pygadm, temp_dir):
         """Test boundary download with country alias."""
-        mock_adm_items = MagicMock()
-        mock_adm_items.to_file = MagicMock()
-        mock_pygadm.AdmItems.return_value = mock_adm_items
-        
-        result = download_boundaries(region="UK", level=0, path=temp_dir)
-        
+        mock_module, _ = mock_pygadm
+
+        result = download_boundaries.fn(region="UK", level=0, path=temp_dir)
+
         assert result["status"] == "success"
         # Verify alias was resolved
-        mock_pygadm.AdmItems.assert_called_once_with(
+        mock_module.AdmItems.assert_called_once_with(
             name="United Kingdom",
             content_level=0
         )
-    
-    @patch('gis_mcp.data.administrative_boundaries.pygadm')
-    def test_download_boundaries_different_levels(self, mock_pygadm, temp_dir):
-        """Test downloading different administrative levels."""
-        mock_adm_items = MagicMock()
-        mock_adm_items.to_file = MagicMock()
-        mock_pygadm.AdmItems.return_value = mock_adm_items
-        
-        # Test level 0 (country)
-        result = download_boundaries(region="USA", level=0, path=temp_dir)
-        assert result["status"] == "success"
-        assert "adm0" in result["file_path"]
-        
-        # Test level 2 (county)
-        result = download_boundaries(region="USA", level=2, path=temp_dir)
+
+    @pytest.mark.parametrize("level", [0, 1, 2, 3])
+    def test_download_boundaries_levels(self, mock_pygadm, temp_dir, level):
+        """Test downloading each administrative level."""
+        mock_module, _ = mock_pygadm
+
+        result = download_boundaries.fn(region="USA", level=level, path=temp_dir)
+
         assert result["status"] == "success"
-        assert "adm2" in result["file_path"]
-    
-    @patch('gis_mcp.data.administrative_boundaries.pygadm')
+        assert f"adm{level}" in result["file_path"]
+        assert mock_module.AdmItems.call_args.kwargs["content_level"] == level
+
     def test_download_boundaries_invalid_region(self, mock_pygadm, temp_dir):
         """Test error handling for invalid region."""
-        mock_pygadm.AdmItems.side_effect = Exception("Region not found")
-        
-        result = download_boundaries(region="INVALID", level=1, path=temp_dir)
-        
+        mock_module, _ = mock_pygadm
+        mock_module.AdmItems.side_effect = Exception("Region not found")
+
+        result = download_boundaries.fn(region="INVALID", level=1, path=temp_dir)
+
         assert result["status"] == "error"
         assert "message" in result
         assert "Region not found" in result["message"]
-    
-    @patch('gis_mcp.data.administrative_boundaries.pygadm', None)
-    @patch('gis_mcp.data.administrative_boundaries._pygadm_available', False)
-    def test_download_boundaries_pygadm_not_installed(self, temp_dir):
+
+    def test_download_boundaries_pygadm_not_installed(self, monkeypatch, temp_dir):
         """Test error when pygadm is not installed."""
-        result = download_boundaries(region="USA", level=1, path=temp_dir)
-        
+        monkeypatch.setattr(
+            'gis_mcp.data.administrative_boundaries.pygadm', None
+        )
+        monkeypatch.setattr(
+            'gis_mcp.data.administrative_boundaries._pygadm_available', False
+        )
+
+        result = download_boundaries.fn(region="USA", level=1, path=temp_dir)
+
         assert result["status"] == "error"
         assert "pygadm is not installed" in result["message"]
-    
-    @patch('gis_mcp.data.administrative_boundaries.pygadm')
-    def test_download_boundaries_default_path(self, mock_pygadm, temp_dir):
+
+    def test_download_boundaries_default_path(self, mock_pygadm, monkeypatch, temp_dir):
         """Test boundary download with default storage path."""
-        mock_adm_items = MagicMock()
-        mock_adm_items.to_file = MagicMock()
-        mock_pygadm.AdmItems.return_value = mock_adm_items
-        
-        with patch('gis_mcp.data.administrative_boundaries.get_storage_path') as mock_storage:
-            mock_storage.return_value = Path(temp_dir)
-            
-            result = download_boundaries(region="USA", level=1)
-            
-            assert result["status"] == "success"
-            assert "administrative_boundaries" in result["file_path"]
-    
-    @patch('gis_mcp.data.administrative_boundaries.pygadm')
+        monkeypatch.setattr(
+            'gis_mcp.data.administrative_boundaries.get_storage_path',
+            lambda: Path(temp_dir)
+        )
+
+        result = download_boundaries.fn(region="USA", level=1)
+
+        assert result["status"] == "success"
+        assert "administrative_boundaries" in result["file_path"]
+
     def test_download_boundaries_file_write_error(self, mock_pygadm, temp_dir):
         """Test error handling when file write fails."""
-        mock_adm_items = MagicMock()
-        mock_adm_items.to_file.side_effect = IOError("Permission denied")
-        mock_pygadm.AdmItems.return_value = mock_adm_items
-        
-        result = download_boundaries(region="USA", level=1, path=temp_dir)
-        
+        _, mock_adm_items = mock_pygadm
+        mock_adm_items.to_parquet.side_effect = IOError("Permission denied")
+
+        result = download_boundaries.fn(region="USA", level=1, path=temp_dir)
+
         assert result["status"] == "error"
         assert "Permission denied" in result["message"]
-    
-    @patch('gis_mcp.data.administrative_boundaries.pygadm')
+
+    def test_download_boundaries_cache_hit(self, mock_pygadm, temp_dir):
+        """Test that a second call for the same region/level uses the on-disk cache."""
+        mock_module, _ = mock_pygadm
+
+        first = download_boundaries.fn(region="USA", level=1, path=temp_dir)
+        second = download_boundaries.fn(region="USA", level=1, path=temp_dir)
+
+        assert first["status"] == "success"
+        assert first["cached"] is False
+        assert second["status"] == "success"
+        assert second["cached"] is True
+        # The GADM fetch ran only once
+        assert mock_module.AdmItems.call_count == 1
+
+        # force_refresh bypasses the cache
+        third = download_boundaries.fn(
+            region="USA", level=1, path=temp_dir, force_refresh=True
+        )
+        assert third["cached"] is False
+        assert mock_module.AdmItems.call_count == 2
+
+    def test_download_boundaries_inmem_cache(self, mock_pygadm, temp_dir):
+        """Test that repeat calls reuse the in-process GeoDataFrame."""
+        mock_module, mock_adm_items = mock_pygadm
+
+        first = download_boundaries.fn(region="USA", level=1, path=temp_dir)
+        # Remove the written file so the second call misses the on-disk
+        # cache and must come from the in-process one
+        Path(first["file_path"]).unlink()
+        second = download_boundaries.fn(region="USA", level=1, path=temp_dir)
+
+        assert first["status"] == "success"
+        assert second["status"] == "success"
+        # One pygadm fetch, two serializations
+        assert mock_module.AdmItems.call_count == 1
+        assert mock_adm_items.to_parquet.call_count == 2
+
+    @pytest.mark.parametrize("fmt,expect", [
+        ("parquet", "to_parquet"),
+        ("fgb", "FlatGeobuf"),
+        ("geojson", "GeoJSON"),
+    ])
+    def test_download_boundaries_formats(self, mock_pygadm, temp_dir, fmt, expect):
+        """Test format dispatch and the resulting file extension."""
+        _, mock_adm_items = mock_pygadm
+
+        result = download_boundaries.fn(
+            region="USA", level=1, path=temp_dir, format=fmt
+        )
+
+        assert result["status"] == "success"
+        assert "United_States_adm1" in result["file_path"]
+        assert result["file_path"].endswith(f".{fmt}")
+        if fmt == "parquet":
+            mock_adm_items.to_parquet.assert_called_once()
+        else:
+            mock_adm_items.to_file.assert_called_once()
+            assert mock_adm_items.to_file.call_args.kwargs["driver"] == expect
+
+    def test_download_boundaries_unsupported_format(self, mock_pygadm, temp_dir):
+        """Test error for an unknown format."""
+        result = download_boundaries.fn(
+            region="USA", level=1, path=temp_dir, format="shapefile"
+        )
+        assert result["status"] == "error"
+        assert "Unsupported format" in result["message"]
+
+    def test_download_boundaries_many_parallel(self, mock_pygadm, temp_dir):
+        """Test that batch downloads overlap instead of running serially."""
+        import time as _time
+
+        mock_module, _ = mock_pygadm
+        delay = 0.05
+        regions = ["Albania", "Belgium", "Chile", "Denmark", "Estonia", "Finland"]
+
+        def slow_fetch(name, content_level):
+            _time.sleep(delay)
+            mock_adm = Mock(spec=["to_parquet"])
+            mock_adm.to_parquet = Mock(side_effect=_write_stub)
+            return mock_adm
+
+        mock_module.AdmItems.side_effect = slow_fetch
+
+        start = _time.perf_counter()
+        result = download_boundaries_many.fn(
+            requests=[{"region": r, "level": 0} for r in regions],
+            path=temp_dir,
+        )
+        elapsed = _time.perf_counter() - start
+
+        assert result["status"] == "success"
+        assert result["success_count"] == len(regions)
+        assert len(result["results"]) == len(regions)
+        assert mock_module.AdmItems.call_count == len(regions)
+        # Overlapped fetches must beat half the serial wall time
+        assert elapsed < (len(regions) * delay) / 2
+
+    def test_download_boundaries_many_malformed_item(self, mock_pygadm, temp_dir):
+        """Test that a malformed batch item fails in place, not the whole batch."""
+        result = download_boundaries_many.fn(
+            requests=[{"region": "USA"}, {"level": 2}, {"region": "UK", "level": 0}],
+            path=temp_dir,
+        )
+
+        assert result["status"] == "partial"
+        assert result["success_count"] == 2
+        assert result["error_count"] == 1
+        assert len(result["results"]) == 3
+        # Results stay in request order with the error in place
+        assert result["results"][0]["status"] == "success"
+        assert result["results"][1]["status"] == "error"
+        assert "region" in result["results"][1]["message"]
+        assert result["results"][2]["status"] == "success"
+
+    def test_download_boundaries_atomic_write(self, mock_pygadm, temp_dir):
+        """Test that a failed write leaves neither the final file nor the sidecar."""
+        _, mock_adm_items = mock_pygadm
+
+        def partial_write(p, **kwargs):
+            Path(p).write_text('{"truncat')
+            raise IOError("disk full")
+
+        mock_adm_items.to_parquet.side_effect = partial_write
+
+        result = download_boundaries.fn(region="USA", level=1, path=temp_dir)
+
+        assert result["status"] == "error"
+        assert not list(Path(temp_dir).glob("*.parquet"))
+        assert not list(Path(temp_dir).glob("*.part"))
+
+        # A later successful call is not poisoned by the earlier failure
+        mock_adm_items.to_parquet.side_effect = _write_stub
+        retry = download_boundaries.fn(region="USA", level=1, path=temp_dir)
+        assert retry["status"] == "success"
+        assert Path(retry["file_path"]).exists()
+
+    def test_download_boundaries_version_bump_misses_cache(
+        self, mock_pygadm, monkeypatch, temp_dir
+    ):
+        """Test that a GADM version change keys a fresh cache entry."""
+        mock_module, _ = mock_pygadm
+
+        monkeypatch.setattr(
+            'gis_mcp.data.administrative_boundaries._gadm_version', lambda: "4.1"
+        )
+        first = download_boundaries.fn(region="USA", level=1, path=temp_dir)
+
+        monkeypatch.setattr(
+            'gis_mcp.data.administrative_boundaries._gadm_version', lambda: "4.2"
+        )
+        second = download_boundaries.fn(region="USA", level=1, path=temp_dir)
+
+        # Different versions map to different files, so the second call
+        # wrote a fresh entry instead of reusing the 4.1 one (the
+        # GeoDataFrame itself may still come from the in-process memo,
+        # which is keyed only on region/level)
+        assert first["file_path"] != second["file_path"]
+        assert second["cached"] is False
+        assert Path(first["file_path"]).exists()
+        assert Path(second["file_path"]).exists()
+
     def test_download_boundaries_creates_directory(self, mock_pygadm, temp_dir):
         """Test that output directory is created if it doesn't exist."""
-        mock_adm_items = MagicMock()
-        mock_adm_items.to_file = MagicMock()
-        mock_pygadm.AdmItems.return_value = mock_adm_items
-        
         nested_path = Path(temp_dir) / "nested" / "path"
-        
-        result = download_boundaries(region="USA", level=1, path=str(nested_path))
-        
+
+        result = download_boundaries.fn(region="USA", level=1, path=str(nested_path))
+
         assert result["status"] == "success"
         assert nested_path.exists()